@@ -0,0 +1,674 @@
+"""
+Module to run the package and pre-commit test suites against every CPython
+interpreter found on the PATH, each in its own isolated harness environment, and
+to merge their results and timings into one matrix report.
+"""
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from test.timing_helpers import PhaseSpan, TimingHelpers
+from typing import Dict, List, Optional, Set, Tuple
+
+from modify_pipfile import modify_pipfile
+
+MATRIX_DIRECTORY = os.path.join("build", "matrix")
+MINIMUM_PYTHON_VERSION = "3.8"
+ENVIRONMENT_STEP_NAME = "environment"
+SUITE_MARKERS = {"packages": "packages", "pre-commit": "pre_commit"}
+HARNESS_FILE_NAMES = ["pytest.ini"]
+HARNESS_DIRECTORY_NAMES = ["test", "packages"]
+INTERPRETER_NAME_EXPRESSION = r"^python(3(\.\d+)?)?(\.exe)?$"
+PROBE_TIMEOUT_SECONDS = 30
+PROBE_SCRIPT = (
+    "import platform, sys; print(platform.python_implementation()); "
+    + "print(platform.python_version()); print(sys.executable)"
+)
+PIPENV_VARIABLES_TO_REMOVE = ["PIPENV_ACTIVE", "PIPENV_PIPFILE", "VIRTUAL_ENV"]
+PHASE_SUMMARY_LIMIT = 10
+
+
+@dataclasses.dataclass()
+class PythonInterpreter:
+    """
+    Class to provide encapsulation on a CPython interpreter found on the PATH.
+    """
+
+    python_version: str
+    executable_path: str
+
+    @property
+    def minor_version(self) -> str:
+        """
+        Major and minor version of the interpreter, such as `3.10`.
+        """
+        return ".".join(self.python_version.split(".")[:2])
+
+
+@dataclasses.dataclass()
+class StepResult:  # pylint: disable=too-many-instance-attributes
+    """
+    Class to provide encapsulation on the result of one step executed for one
+    interpreter, either building its environment or running one of the suites.
+    A return code of None means that the step was never run.  The phase spans
+    are keyed by test, as they are read from the phase report of a suite.
+    """
+
+    interpreter: PythonInterpreter
+    step_name: str
+    cell_directory: str
+    return_code: Optional[int]
+    elapsed_seconds: float
+    log_path: Optional[str]
+    test_outcomes: Dict[str, Tuple[str, float]]
+    phase_spans: Dict[str, List[PhaseSpan]] = dataclasses.field(default_factory=dict)
+
+    def count_outcomes(self) -> Dict[str, int]:
+        """
+        Count the tests in the step with each outcome.
+        """
+        outcome_counts: Dict[str, int] = {}
+        for outcome, _ in self.test_outcomes.values():
+            outcome_counts[outcome] = outcome_counts.get(outcome, 0) + 1
+        return outcome_counts
+
+
+class MatrixRunner:
+    """
+    Class to provide methods to find the interpreters, build an environment for
+    each of them, run the suites in each environment, and report on the results.
+    """
+
+    @staticmethod
+    def __version_key(python_version: str) -> Tuple[int, ...]:
+        """
+        Get a key to sort versions by, ignoring any release level suffix.
+        """
+
+        return tuple(int(i) for i in re.findall(r"\d+", python_version)[:3])
+
+    @staticmethod
+    def __probe_interpreter(executable_path: str) -> Optional[PythonInterpreter]:
+        """
+        Ask the executable what it is, returning None if it is not a working
+        CPython interpreter.  Launchers, such as pyenv shims for versions that are
+        not active, fail here and are skipped.
+        """
+
+        try:
+            probe_result = subprocess.run(
+                [executable_path, "-c", PROBE_SCRIPT],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=PROBE_TIMEOUT_SECONDS,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        probe_lines = probe_result.stdout.decode("utf-8").splitlines()
+        if probe_result.returncode != 0 or len(probe_lines) != 3:
+            return None
+        if probe_lines[0] != "CPython":
+            return None
+        return PythonInterpreter(probe_lines[1], probe_lines[2])
+
+    @staticmethod
+    def find_interpreters(
+        minimum_version: str, requested_versions: Optional[List[str]]
+    ) -> List[PythonInterpreter]:
+        """
+        Find every CPython interpreter on the PATH, keeping the first one found
+        for each minor version, as the shell would.
+        """
+
+        interpreters_by_version: Dict[str, PythonInterpreter] = {}
+        probed_paths: Set[str] = set()
+        for path_directory in os.environ.get("PATH", "").split(os.pathsep):
+            if not os.path.isdir(path_directory):
+                continue
+            for file_name in sorted(os.listdir(path_directory)):
+                executable_path = os.path.join(path_directory, file_name)
+                if (
+                    not re.match(INTERPRETER_NAME_EXPRESSION, file_name, re.IGNORECASE)
+                    or not os.path.isfile(executable_path)
+                    or not os.access(executable_path, os.X_OK)
+                    or executable_path in probed_paths
+                ):
+                    continue
+                probed_paths.add(executable_path)
+                interpreter = MatrixRunner.__probe_interpreter(executable_path)
+                if (
+                    interpreter
+                    and interpreter.minor_version not in interpreters_by_version
+                    and MatrixRunner.__version_key(interpreter.python_version)
+                    >= MatrixRunner.__version_key(minimum_version)
+                    and (
+                        not requested_versions
+                        or interpreter.minor_version in requested_versions
+                    )
+                ):
+                    print(
+                        f"Found Python {interpreter.python_version} at "
+                        + f"'{executable_path}'."
+                    )
+                    interpreters_by_version[interpreter.minor_version] = interpreter
+        return sorted(
+            interpreters_by_version.values(),
+            key=lambda i: MatrixRunner.__version_key(i.python_version),
+        )
+
+    @staticmethod
+    def __build_environment_dict() -> Dict[str, str]:
+        """
+        Build the environment for PipEnv, making sure that it creates its own
+        environment next to the copied Pipfile, instead of using any environment
+        that the runner itself was started from.
+        """
+
+        environment_dict = dict(
+            os.environ.copy(),
+            **{"PIPENV_VENV_IN_PROJECT": "1", "PIPENV_IGNORE_VIRTUALENVS": "1"},
+        )
+        for variable_name in PIPENV_VARIABLES_TO_REMOVE:
+            environment_dict.pop(variable_name, None)
+        return environment_dict
+
+    @staticmethod
+    def __run_logged_commands(
+        command_list: List[List[str]], cell_directory: str, log_path: str
+    ) -> Tuple[int, float]:
+        """
+        Run each command in turn, appending its output to the log, and stopping
+        at the first command to fail.
+        """
+
+        environment_dict = MatrixRunner.__build_environment_dict()
+        return_code = 0
+        start_time = time.perf_counter()
+        with open(log_path, "at", encoding="utf-8") as log_file:
+            for command_arguments in command_list:
+                log_file.write(f"Arguments: {command_arguments}\n")
+                log_file.flush()
+                return_code = subprocess.run(
+                    command_arguments,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    cwd=cell_directory,
+                    env=environment_dict,
+                    check=False,
+                ).returncode
+                if return_code:
+                    break
+        return return_code, time.perf_counter() - start_time
+
+    @staticmethod
+    def __copy_harness(cell_directory: str, interpreter: PythonInterpreter) -> None:
+        """
+        Copy everything the suites need into the directory for the interpreter,
+        with a copy of the Pipfile that requires the version of that interpreter.
+        The checked-in Pipfile is left alone.
+        """
+
+        if os.path.exists(cell_directory):
+            shutil.rmtree(cell_directory)
+        os.makedirs(cell_directory)
+        modify_pipfile(
+            "Pipfile",
+            os.path.join(cell_directory, "Pipfile"),
+            interpreter.minor_version,
+        )
+        for file_name in HARNESS_FILE_NAMES:
+            shutil.copy2(file_name, os.path.join(cell_directory, file_name))
+        for directory_name in HARNESS_DIRECTORY_NAMES:
+            destination_directory = os.path.join(cell_directory, directory_name)
+            if os.path.isdir(directory_name):
+                shutil.copytree(
+                    directory_name,
+                    destination_directory,
+                    ignore=shutil.ignore_patterns("__pycache__"),
+                )
+            else:
+                os.makedirs(destination_directory)
+
+    @staticmethod
+    def prepare_environment(
+        interpreter: PythonInterpreter, matrix_directory: str
+    ) -> StepResult:
+        """
+        Build the isolated harness environment for the interpreter, the same way
+        that the workflow does.
+        """
+
+        cell_directory = os.path.abspath(
+            os.path.join(matrix_directory, f"python-{interpreter.minor_version}")
+        )
+        MatrixRunner.__copy_harness(cell_directory, interpreter)
+        log_path = os.path.join(cell_directory, f"{ENVIRONMENT_STEP_NAME}.log")
+        return_code, elapsed_seconds = MatrixRunner.__run_logged_commands(
+            [
+                ["pipenv", "lock", "--python", interpreter.executable_path],
+                ["pipenv", "sync"],
+                ["pipenv", "uninstall", "pytest-html"],
+            ],
+            cell_directory,
+            log_path,
+        )
+        return StepResult(
+            interpreter,
+            ENVIRONMENT_STEP_NAME,
+            cell_directory,
+            return_code,
+            elapsed_seconds,
+            log_path,
+            {},
+        )
+
+    @staticmethod
+    def __read_junit_outcomes(junit_path: str) -> Dict[str, Tuple[str, float]]:
+        """
+        Read the outcome and duration of each test from a JUnit report.
+        """
+
+        test_outcomes: Dict[str, Tuple[str, float]] = {}
+        if not os.path.exists(junit_path):
+            return test_outcomes
+        for test_case in ET.parse(junit_path).getroot().iter("testcase"):
+            outcome = "passed"
+            for outcome_name in ("failure", "error", "skipped"):
+                if test_case.find(outcome_name) is not None:
+                    outcome = {"failure": "failed"}.get(outcome_name, outcome_name)
+                    break
+            test_id = f"{test_case.get('classname', '')}::{test_case.get('name', '')}"
+            test_outcomes[test_id] = (outcome, float(test_case.get("time", "0")))
+        return test_outcomes
+
+    @staticmethod
+    def __read_phase_spans(phase_report_path: str) -> Dict[str, List[PhaseSpan]]:
+        """
+        Read the spans of each test back from the phase report of a suite.
+        """
+
+        phase_spans: Dict[str, List[PhaseSpan]] = {}
+        if not os.path.exists(phase_report_path):
+            return phase_spans
+        with open(phase_report_path, "rt", encoding="utf-8") as report_file:
+            phase_report = json.load(report_file)
+        for test_id, test_report in phase_report.get("tests", {}).items():
+            phase_spans[test_id] = [
+                PhaseSpan(i["phase"], 0.0, float(i["seconds"]))
+                for i in test_report.get("phases", [])
+            ]
+        return phase_spans
+
+    @staticmethod
+    def run_suite(
+        environment_result: StepResult, suite_name: str, pytest_arguments: List[str]
+    ) -> StepResult:
+        """
+        Run one of the suites in the environment built for the interpreter.  Each
+        suite gets its own pytest cache and reports, so that the suites can run
+        at the same time in the same environment.
+        """
+
+        suite_directory = os.path.join("build", "test", suite_name)
+        junit_path = os.path.join(suite_directory, "results.xml")
+        phase_report_path = os.path.join(suite_directory, "phase_timings.json")
+        log_path = os.path.join(environment_result.cell_directory, f"{suite_name}.log")
+        return_code, elapsed_seconds = MatrixRunner.__run_logged_commands(
+            [
+                [
+                    "pipenv",
+                    "run",
+                    "pytest",
+                    "--durations=0",
+                    "--capture=tee-sys",
+                    "-m",
+                    SUITE_MARKERS[suite_name],
+                    "-o",
+                    f"cache_dir={os.path.join(suite_directory, '.pytest_cache')}",
+                    f"--junitxml={junit_path}",
+                    f"--phase-report={phase_report_path}",
+                    *pytest_arguments,
+                ]
+            ],
+            environment_result.cell_directory,
+            log_path,
+        )
+        return StepResult(
+            environment_result.interpreter,
+            suite_name,
+            environment_result.cell_directory,
+            return_code,
+            elapsed_seconds,
+            log_path,
+            MatrixRunner.__read_junit_outcomes(
+                os.path.join(environment_result.cell_directory, junit_path)
+            ),
+            MatrixRunner.__read_phase_spans(
+                os.path.join(environment_result.cell_directory, phase_report_path)
+            ),
+        )
+
+    @staticmethod
+    def run_matrix(
+        interpreters: List[PythonInterpreter],
+        matrix_directory: str,
+        pytest_arguments: List[str],
+        worker_count: Optional[int],
+    ) -> List[StepResult]:
+        """
+        Build the environment for each interpreter in a process pool, and as each
+        environment is ready, run each of the suites in it in the same pool.
+        """
+
+        step_results: List[StepResult] = []
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=worker_count
+        ) as executor:
+            pending_futures = {
+                executor.submit(MatrixRunner.prepare_environment, i, matrix_directory)
+                for i in interpreters
+            }
+            while pending_futures:
+                done_futures, pending_futures = concurrent.futures.wait(
+                    pending_futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for next_future in done_futures:
+                    step_result = next_future.result()
+                    step_results.append(step_result)
+                    print(
+                        f"Python {step_result.interpreter.minor_version} "
+                        + f"{step_result.step_name}: return code "
+                        + f"{step_result.return_code} after "
+                        + f"{step_result.elapsed_seconds:.1f}s."
+                    )
+                    if step_result.step_name != ENVIRONMENT_STEP_NAME:
+                        continue
+                    for suite_name in SUITE_MARKERS:
+                        if step_result.return_code == 0:
+                            pending_futures.add(
+                                executor.submit(
+                                    MatrixRunner.run_suite,
+                                    step_result,
+                                    suite_name,
+                                    pytest_arguments,
+                                )
+                            )
+                        else:
+                            step_results.append(
+                                dataclasses.replace(
+                                    step_result,
+                                    step_name=suite_name,
+                                    return_code=None,
+                                    elapsed_seconds=0.0,
+                                    log_path=None,
+                                )
+                            )
+        return step_results
+
+    @staticmethod
+    def __format_table(
+        column_names: List[str], table_rows: List[List[str]]
+    ) -> List[str]:
+        """
+        Format the rows into right aligned columns.
+        """
+
+        column_widths = [
+            max(len(str(j)) for j in [column_names[i], *(k[i] for k in table_rows)])
+            for i in range(len(column_names))
+        ]
+        return [
+            "  ".join(str(j).rjust(column_widths[i]) for i, j in enumerate(next_row))
+            for next_row in [column_names, *table_rows]
+        ]
+
+    @staticmethod
+    def __summarize_step(step_result: Optional[StepResult]) -> str:
+        """
+        Summarize a step as its outcome counts and duration, for one cell of the
+        matrix.
+        """
+
+        if step_result is None or step_result.return_code is None:
+            return "not run"
+        outcome_counts = step_result.count_outcomes()
+        outcome_summary = " ".join(
+            f"{outcome_counts[i]} {i}" for i in sorted(outcome_counts)
+        )
+        if step_result.step_name == ENVIRONMENT_STEP_NAME or not outcome_summary:
+            outcome_summary = "ok" if step_result.return_code == 0 else "failed"
+        return f"{outcome_summary} ({step_result.elapsed_seconds:.1f}s)"
+
+    @staticmethod
+    def __find_differing_tests(
+        step_results: List[StepResult],
+    ) -> Dict[str, Dict[str, Tuple[str, float]]]:
+        """
+        Collect the outcome of each test for each interpreter, keeping only those
+        tests whose outcome is not the same for every interpreter.
+        """
+
+        minor_versions = {i.interpreter.minor_version for i in step_results}
+        outcomes_by_test: Dict[str, Dict[str, Tuple[str, float]]] = {}
+        for step_result in step_results:
+            for test_id, test_outcome in step_result.test_outcomes.items():
+                outcomes_by_test.setdefault(test_id, {})[
+                    step_result.interpreter.minor_version
+                ] = test_outcome
+        return {
+            test_id: test_outcomes
+            for test_id, test_outcomes in outcomes_by_test.items()
+            if len({i[0] for i in test_outcomes.values()}) > 1
+            or set(test_outcomes) != minor_versions
+        }
+
+    @staticmethod
+    def __combine_phase_spans(
+        step_results: List[StepResult],
+    ) -> Dict[str, List[PhaseSpan]]:
+        """
+        Combine the spans from every step, keying each test by its interpreter as
+        well, so that the same test run under different interpreters is kept.
+        """
+
+        return {
+            f"{step_result.interpreter.minor_version}::{test_id}": recorded_spans
+            for step_result in step_results
+            for test_id, recorded_spans in step_result.phase_spans.items()
+        }
+
+    @staticmethod
+    def __compare_phases(
+        step_results: List[StepResult],
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compare the total time spent in each phase by each interpreter.
+        """
+
+        phase_comparison: Dict[str, Dict[str, float]] = {}
+        for minor_version in sorted(
+            {i.interpreter.minor_version for i in step_results},
+            key=MatrixRunner.__version_key,
+        ):
+            for phase_summary in TimingHelpers.summarize_phases(
+                MatrixRunner.__combine_phase_spans(
+                    [
+                        i
+                        for i in step_results
+                        if i.interpreter.minor_version == minor_version
+                    ]
+                )
+            ):
+                phase_comparison.setdefault(phase_summary["phase"], {})[
+                    minor_version
+                ] = phase_summary["total_seconds"]
+        return phase_comparison
+
+    @staticmethod
+    def report_matrix(step_results: List[StepResult], report_path: str) -> None:
+        """
+        Print the matrix of interpreters and suites, and any tests whose outcome
+        depends on the interpreter, and write every result to a JSON report.
+        """
+
+        step_names = [ENVIRONMENT_STEP_NAME, *SUITE_MARKERS]
+        results_by_cell = {
+            (i.interpreter.minor_version, i.step_name): i for i in step_results
+        }
+        table_rows = [
+            [
+                interpreter.python_version,
+                *(
+                    MatrixRunner.__summarize_step(
+                        results_by_cell.get((interpreter.minor_version, i))
+                    )
+                    for i in step_names
+                ),
+            ]
+            for interpreter in sorted(
+                {
+                    i.interpreter.minor_version: i.interpreter for i in step_results
+                }.values(),
+                key=lambda i: MatrixRunner.__version_key(i.python_version),
+            )
+        ]
+        print("\nTest matrix:\n")
+        for next_line in MatrixRunner.__format_table(
+            ["python", *step_names], table_rows
+        ):
+            print(next_line)
+
+        differing_tests = MatrixRunner.__find_differing_tests(step_results)
+        if differing_tests:
+            print("\nTests whose outcome depends on the interpreter:\n")
+            for test_id, test_outcomes in sorted(differing_tests.items()):
+                print(
+                    f"  {test_id}: "
+                    + ", ".join(
+                        f"{i} {test_outcomes[i][0]}"
+                        for i in sorted(test_outcomes, key=MatrixRunner.__version_key)
+                    )
+                )
+
+        phase_summaries = TimingHelpers.summarize_phases(
+            MatrixRunner.__combine_phase_spans(step_results)
+        )
+        if phase_summaries:
+            print("\nSlowest phases across the matrix:\n")
+            for next_line in TimingHelpers.format_phase_summary(
+                phase_summaries, PHASE_SUMMARY_LIMIT
+            ):
+                print(next_line)
+
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        with open(report_path, "wt", encoding="utf-8") as report_file:
+            json.dump(
+                {
+                    "steps": [
+                        {
+                            "python_version": i.interpreter.python_version,
+                            "executable_path": i.interpreter.executable_path,
+                            "step": i.step_name,
+                            "return_code": i.return_code,
+                            "elapsed_seconds": i.elapsed_seconds,
+                            "log_path": i.log_path,
+                            "outcome_counts": i.count_outcomes(),
+                            "tests": {
+                                test_id: {"outcome": j[0], "seconds": j[1]}
+                                for test_id, j in sorted(i.test_outcomes.items())
+                            },
+                            "phases": TimingHelpers.summarize_phases(i.phase_spans),
+                        }
+                        for i in step_results
+                    ],
+                    "differing_tests": sorted(differing_tests),
+                    "phases": phase_summaries,
+                    "phases_by_python": MatrixRunner.__compare_phases(step_results),
+                },
+                report_file,
+                indent=2,
+            )
+        print(f"\nMatrix report written to '{os.path.abspath(report_path)}'.")
+
+
+def __parse_arguments() -> argparse.Namespace:
+    """
+    Parse the command line arguments for the runner.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Run the package and pre-commit suites against every CPython "
+        + "interpreter on the PATH."
+    )
+    parser.add_argument(
+        "--python",
+        dest="python_versions",
+        action="append",
+        help="only run against this minor version, such as 3.10 (may be repeated)",
+    )
+    parser.add_argument(
+        "--minimum-version",
+        dest="minimum_version",
+        default=MINIMUM_PYTHON_VERSION,
+        help="ignore interpreters older than this version",
+    )
+    parser.add_argument(
+        "--jobs",
+        dest="worker_count",
+        type=int,
+        default=None,
+        help="number of steps to run at the same time (defaults to the CPU count)",
+    )
+    parser.add_argument(
+        "--matrix-directory",
+        dest="matrix_directory",
+        default=MATRIX_DIRECTORY,
+        help="directory to build the environments in and write the report to",
+    )
+    parser.add_argument(
+        "pytest_arguments",
+        nargs=argparse.REMAINDER,
+        help="any further arguments are passed on to pytest, after a `--`",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """
+    Run the matrix, returning zero only if every step passed.
+    """
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    parsed_arguments = __parse_arguments()
+    pytest_arguments = [i for i in parsed_arguments.pytest_arguments if i != "--"]
+
+    interpreters = MatrixRunner.find_interpreters(
+        parsed_arguments.minimum_version, parsed_arguments.python_versions
+    )
+    if not interpreters:
+        print("No CPython interpreters were found on the PATH.")
+        return 1
+
+    step_results = MatrixRunner.run_matrix(
+        interpreters,
+        parsed_arguments.matrix_directory,
+        pytest_arguments,
+        parsed_arguments.worker_count,
+    )
+    MatrixRunner.report_matrix(
+        step_results,
+        os.path.join(parsed_arguments.matrix_directory, "matrix_report.json"),
+    )
+    return 0 if all(i.return_code == 0 for i in step_results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
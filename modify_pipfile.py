@@ -1,22 +1,51 @@
+"""
+Module to replace the python version required by the Pipfile.
+"""
 import sys
 
-current_python_version = sys.version
-index = current_python_version.index("(")
-current_python_version = current_python_version[:index].strip()
-
-file_path = "Pipfile"
-with open(file_path, "rt", encoding="utf-8") as input_file:
-    all_lines = input_file.readlines()
-
-modified_lines = []
-did_find = False
-for i in all_lines:
-    if not did_find and i == 'python_version = "3.8"\n':
-        i = f'python_version = "{current_python_version}"\n'
-        did_find = True
-    modified_lines.append(i)
-
-assert did_find, "Did not find and replace python version with current version."
-with open(file_path, "wt", encoding="utf-8") as output_file:
-    output_file.writelines(modified_lines)
-print(f"Replaced Pipfile version with '{current_python_version}'.")
+
+def get_current_python_version() -> str:
+    """
+    Get a cleaned up version of the current python.
+    """
+
+    python_version = sys.version
+    index = python_version.index("(")
+    return python_version[:index].strip()
+
+
+def modify_pipfile(input_path: str, output_path: str, python_version: str) -> None:
+    """
+    Copy the Pipfile, replacing the python version that it requires with the
+    provided version.  The input and output paths may be the same.
+    """
+
+    with open(input_path, "rt", encoding="utf-8") as input_file:
+        all_lines = input_file.readlines()
+
+    modified_lines = []
+    did_find = False
+    for i in all_lines:
+        if not did_find and i == 'python_version = "3.8"\n':
+            i = f'python_version = "{python_version}"\n'
+            did_find = True
+        modified_lines.append(i)
+
+    assert did_find, "Did not find and replace python version with current version."
+    with open(output_path, "wt", encoding="utf-8") as output_file:
+        output_file.writelines(modified_lines)
+
+
+def main() -> None:
+    """
+    Replace the version in the checked-in Pipfile with the current version, as
+    the workflow does before creating its environment.
+    """
+
+    python_version = get_current_python_version()
+    modify_pipfile("Pipfile", "Pipfile", python_version)
+    print(f"Replaced Pipfile version with '{python_version}'.")
+
+
+if __name__ == "__main__":
+    main()
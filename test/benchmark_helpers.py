@@ -0,0 +1,516 @@
+"""
+Module to provide helper methods for the benchmark and stress scenarios.
+"""
+import json
+import math
+import os
+import re
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .util_helpers import InstalledPyMarkdown, MeasuredBob, UtilHelpers
+
+BYTES_PER_KILOBYTE = 1024
+BYTES_PER_MEGABYTE = 1024 * BYTES_PER_KILOBYTE
+MARKDOWN_FILES_PER_DIRECTORY = 100
+MISSING_HEADING_INTERVAL = 7
+PACKAGES_PER_SCOPE = 250
+NOISE_FILES_PER_PACKAGE = ["package.json", "index.js", "index.d.ts", "LICENSE"]
+NOISE_NESTING_DEPTH = 40
+STREAM_CHUNK_BYTES = 64 * BYTES_PER_KILOBYTE
+CONFIGURED_PLUGIN_COUNT = 48
+DEFAULT_PLUGIN_PROPERTIES: Dict[str, Dict[str, Any]] = {
+    "md003": {"style": "consistent"},
+    "md004": {"style": "consistent"},
+    "md013": {"line_length": 80},
+}
+SCAN_FAILURE_REGEX = re.compile(r"^.+:\d+:\d+: [A-Za-z]+\d+: ")
+
+
+class BenchmarkHelpers:
+    """
+    Class to provide helper methods for generating benchmark inputs, and for
+    summarizing and reporting on benchmark measurements.
+    """
+
+    @staticmethod
+    def generate_markdown_section(section_index: int) -> str:
+        """
+        Generate one section of a Markdown document, exercising a mix of the
+        common block and inline elements.
+        """
+
+        return (
+            f"## Section {section_index}\n"
+            + "\n"
+            + f"This is paragraph {section_index}, with *emphasis*, **strong emphasis**,\n"
+            + f"`code spans`, and a [reference to section {section_index}]"
+            + f"(https://example.com/{section_index}).\n"
+            + "\n"
+            + f"- first item of list {section_index}\n"
+            + "- second item, with a nested list:\n"
+            + "  1. nested item one\n"
+            + "  1. nested item two\n"
+            + "\n"
+            + "> a block quote that\n"
+            + "> spans two lines\n"
+            + "\n"
+            + "```text\n"
+            + f"code block {section_index}\n"
+            + "```\n"
+            + "\n"
+        )
+
+    @staticmethod
+    def expected_missing_heading_count(file_count: int) -> int:
+        """
+        Calculate how many of the first file_count generated documents are missing
+        their top level heading, and therefore report an MD041 failure.
+        """
+
+        return len(range(0, file_count, MISSING_HEADING_INTERVAL))
+
+    @staticmethod
+    def is_missing_heading(document_index: int) -> bool:
+        """
+        Determine whether the generated document with the given index is missing
+        its top level heading.
+        """
+
+        return not document_index % MISSING_HEADING_INTERVAL
+
+    @staticmethod
+    def generate_markdown_document(document_index: int, section_count: int) -> str:
+        """
+        Generate a Markdown document.  Every seventh document is missing its top
+        level heading, so that scans of the corpus report a known set of MD041 failures.
+        """
+
+        document_parts = []
+        if not BenchmarkHelpers.is_missing_heading(document_index):
+            document_parts.append(f"# Document {document_index}\n\n")
+        document_parts.extend(
+            BenchmarkHelpers.generate_markdown_section(i) for i in range(section_count)
+        )
+        return "".join(document_parts).rstrip("\n") + "\n"
+
+    @staticmethod
+    def get_corpus_file_path(document_index: int) -> str:
+        """
+        Get the relative path of a document within a generated corpus, with the
+        documents spread over directories to keep each directory small.
+        """
+
+        return os.path.join(
+            f"part_{document_index // MARKDOWN_FILES_PER_DIRECTORY:04d}",
+            f"document_{document_index:06d}.md",
+        )
+
+    @staticmethod
+    def generate_markdown_corpus(
+        destination_directory: str, file_count: int, section_count: int = 5
+    ) -> int:
+        """
+        Generate a corpus of Markdown documents, returning the total number of bytes.
+        """
+
+        total_bytes = 0
+        for document_index in range(file_count):
+            file_path = os.path.join(
+                destination_directory,
+                BenchmarkHelpers.get_corpus_file_path(document_index),
+            )
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            document_bytes = BenchmarkHelpers.generate_markdown_document(
+                document_index, section_count
+            ).encode("utf-8")
+            with open(file_path, "wb") as output_file:
+                output_file.write(document_bytes)
+            total_bytes += len(document_bytes)
+        print(
+            f"Generated {file_count} Markdown files ({total_bytes} bytes) "
+            + f"in '{destination_directory}'."
+        )
+        return total_bytes
+
+    @staticmethod
+    def generate_markdown_stream(
+        target_bytes: int, chunk_bytes: int = STREAM_CHUNK_BYTES
+    ) -> Iterator[bytes]:
+        """
+        Generate one Markdown document of at least the target size, one chunk at
+        a time, so that documents far larger than memory can be generated.  Each
+        chunk holds whole sections, each starting with the blank line that separates
+        it from the previous one, so the document always ends with a single newline.
+        """
+
+        generated_bytes = 0
+        section_index = 0
+        chunk_parts = [b"# Streamed Document\n"]
+        chunk_size = len(chunk_parts[0])
+        while generated_bytes + chunk_size < target_bytes:
+            section_text = BenchmarkHelpers.generate_markdown_section(section_index)
+            next_section = f"\n{section_text.rstrip()}\n".encode("utf-8")
+            section_index += 1
+            chunk_parts.append(next_section)
+            chunk_size += len(next_section)
+            if chunk_size >= chunk_bytes:
+                yield b"".join(chunk_parts)
+                generated_bytes += chunk_size
+                chunk_parts, chunk_size = [], 0
+        if chunk_parts:
+            yield b"".join(chunk_parts)
+
+    @staticmethod
+    def __create_symbolic_link(link_target: str, link_path: str) -> int:
+        """
+        Create a symbolic link, returning how many were created, as creating them
+        requires extra privileges on some platforms.
+        """
+
+        try:
+            os.symlink(link_target, link_path, target_is_directory=True)
+        except (OSError, NotImplementedError):
+            return 0
+        return 1
+
+    @staticmethod
+    def __generate_noise_package(package_directory: str) -> int:
+        """
+        Generate one `node_modules` style package, with empty files, as only the
+        number of entries matters to the walk.
+        """
+
+        library_directory = os.path.join(package_directory, "lib")
+        os.makedirs(library_directory)
+        for file_name in NOISE_FILES_PER_PACKAGE:
+            with open(os.path.join(package_directory, file_name), "wb"):
+                pass
+        with open(os.path.join(library_directory, "module.js"), "wb"):
+            pass
+        return len(NOISE_FILES_PER_PACKAGE) + 3
+
+    @staticmethod
+    def generate_noisy_tree(
+        destination_directory: str, noise_entry_count: int, markdown_file_count: int
+    ) -> int:
+        """
+        Generate a tree like a real repository, with a small corpus of Markdown
+        documents in `docs`, one document at the bottom of a deeply nested
+        directory, and roughly the requested number of non-Markdown entries in
+        a `node_modules` directory, with symbolic links between them and a link
+        that loops back to the top of the tree.  Returns the number of
+        non-Markdown entries that were created.
+        """
+
+        BenchmarkHelpers.generate_markdown_corpus(
+            os.path.join(destination_directory, "docs"), markdown_file_count, 1
+        )
+
+        nested_directory = os.path.join(
+            destination_directory,
+            "deep",
+            *[f"level_{i:02d}" for i in range(NOISE_NESTING_DEPTH)],
+        )
+        os.makedirs(nested_directory)
+        with open(
+            os.path.join(nested_directory, "nested.md"), "wt", encoding="utf-8"
+        ) as output_file:
+            output_file.write(BenchmarkHelpers.generate_markdown_document(1, 1))
+        noise_entry_total = NOISE_NESTING_DEPTH + 1
+
+        modules_directory = os.path.join(destination_directory, "node_modules")
+        os.makedirs(modules_directory)
+        noise_entry_total += 1 + BenchmarkHelpers.__create_symbolic_link(
+            "..", os.path.join(modules_directory, "loop")
+        )
+        package_index = 0
+        while noise_entry_total < noise_entry_count:
+            scope_directory = os.path.join(
+                modules_directory, f"@scope_{package_index // PACKAGES_PER_SCOPE:04d}"
+            )
+            if not package_index % PACKAGES_PER_SCOPE:
+                os.makedirs(scope_directory)
+                noise_entry_total += 1
+                if package_index:
+                    noise_entry_total += BenchmarkHelpers.__create_symbolic_link(
+                        os.path.join("..", "@scope_0000", "package_000000"),
+                        os.path.join(scope_directory, "linked_package"),
+                    )
+            noise_entry_total += BenchmarkHelpers.__generate_noise_package(
+                os.path.join(scope_directory, f"package_{package_index:06d}")
+            )
+            package_index += 1
+
+        print(
+            f"Generated {noise_entry_total} non-Markdown entries "
+            + f"in '{destination_directory}'."
+        )
+        return noise_entry_total
+
+    @staticmethod
+    def __get_synthetic_property(property_index: int) -> Tuple[str, str]:
+        """
+        Get the plugin and the name of a synthetic property, spreading the
+        properties over the plugins.
+        """
+
+        return (
+            f"md{property_index % CONFIGURED_PLUGIN_COUNT + 1:03d}",
+            f"x_property_{property_index:06d}",
+        )
+
+    @staticmethod
+    def generate_configuration(property_count: int) -> Dict[str, Any]:
+        """
+        Generate a configuration with the requested number of per-plugin properties.
+        Other than the real properties, which are set to their default values, the
+        properties are not used by any plugin, so the configuration does not change
+        the results of a scan.
+        """
+
+        plugin_properties: Dict[str, Dict[str, Any]] = {
+            plugin_id: dict(default_properties)
+            for plugin_id, default_properties in DEFAULT_PLUGIN_PROPERTIES.items()
+        }
+        for property_index in range(property_count):
+            plugin_id, property_name = BenchmarkHelpers.__get_synthetic_property(
+                property_index
+            )
+            plugin_properties.setdefault(plugin_id, {})[property_name] = property_index
+        return {"plugins": plugin_properties}
+
+    @staticmethod
+    def generate_set_arguments(property_count: int) -> List[str]:
+        """
+        Generate `--set` arguments for the requested number of per-plugin
+        properties, with the same properties as the generated configuration.
+        """
+
+        set_arguments = []
+        for plugin_id, default_properties in DEFAULT_PLUGIN_PROPERTIES.items():
+            for property_name, property_value in default_properties.items():
+                set_value = (
+                    f"$#{property_value}"
+                    if isinstance(property_value, int)
+                    else f"$${property_value}"
+                )
+                set_arguments.extend(
+                    ["--set", f"plugins.{plugin_id}.{property_name}={set_value}"]
+                )
+        for property_index in range(property_count):
+            plugin_id, property_name = BenchmarkHelpers.__get_synthetic_property(
+                property_index
+            )
+            set_arguments.extend(
+                ["--set", f"plugins.{plugin_id}.{property_name}=$#{property_index}"]
+            )
+        return set_arguments
+
+    @staticmethod
+    def generate_synthetic_plugins(
+        destination_directory: str, plugin_count: int, work_per_token: int
+    ) -> List[str]:
+        """
+        Generate synthetic rule plugins from the template, each of which hashes the
+        name of every token it visits the specified number of times.  Returns the
+        paths of the generated plugin modules.
+        """
+
+        template_lines = UtilHelpers.load_templated_output(
+            "synthetic_plugins", "plugin_template"
+        )
+        os.makedirs(destination_directory, exist_ok=True)
+        plugin_paths = []
+        for plugin_number in range(1, plugin_count + 1):
+            plugin_index = f"{plugin_number:03d}"
+            plugin_path = os.path.join(
+                destination_directory, f"synthetic_rule_{plugin_index}.py"
+            )
+            with open(plugin_path, "wt", encoding="utf-8") as output_file:
+                output_file.writelines(
+                    next_line.replace("{{plugin-index}}", plugin_index).replace(
+                        "{{work-per-token}}", str(work_per_token)
+                    )
+                    + "\n"
+                    for next_line in template_lines
+                )
+            plugin_paths.append(plugin_path)
+        return plugin_paths
+
+    @staticmethod
+    def extract_scan_failures(std_out: str) -> List[str]:
+        """
+        Extract the lines reporting scan failures from the output, ignoring any
+        other lines, such as log messages.
+        """
+
+        return sorted(
+            next_line
+            for next_line in std_out.splitlines()
+            if SCAN_FAILURE_REGEX.match(next_line)
+        )
+
+    @staticmethod
+    def calculate_percentile(values: Sequence[float], percentile: float) -> float:
+        """
+        Calculate the specified percentile of the values, using the nearest rank.
+        """
+
+        assert values, "Cannot calculate a percentile without any values."
+        sorted_values = sorted(values)
+        rank = max(1, math.ceil(percentile / 100.0 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    @staticmethod
+    def calculate_median(values: Sequence[float]) -> float:
+        """
+        Calculate the median of the values.
+        """
+
+        return BenchmarkHelpers.calculate_percentile(values, 50.0)
+
+    @staticmethod
+    def calculate_slope(x_values: Sequence[float], y_values: Sequence[float]) -> float:
+        """
+        Calculate the slope of the least squares line through the points, which
+        is far less sensitive to noise than the difference between any two points.
+        """
+
+        assert len(x_values) == len(y_values) and len(set(x_values)) > 1
+        x_mean = sum(x_values) / len(x_values)
+        y_mean = sum(y_values) / len(y_values)
+        return sum(
+            (x - x_mean) * (y - y_mean) for x, y in zip(x_values, y_values)
+        ) / sum((x - x_mean) ** 2 for x in x_values)
+
+    @staticmethod
+    def measure_median_command(
+        command_arguments: List[str],
+        directory_path: str,
+        environment_dict: Dict[str, str],
+        repeat_count: int,
+    ) -> Tuple[float, MeasuredBob]:
+        """
+        Execute a command repeatedly, returning the median time it took and the
+        result of the last execution.
+        """
+
+        command_results = [
+            UtilHelpers.run_measured_command(
+                command_arguments, directory_path, environment_dict
+            )
+            for _ in range(repeat_count)
+        ]
+        return (
+            BenchmarkHelpers.calculate_median(
+                [i.elapsed_seconds for i in command_results]
+            ),
+            command_results[-1],
+        )
+
+    @staticmethod
+    def measure_startup_and_scan(
+        installed_pymarkdown: InstalledPyMarkdown,
+        directory_path: str,
+        pymarkdown_arguments: List[str],
+        repeat_count: int,
+    ) -> Tuple[float, float, List[str], MeasuredBob]:
+        """
+        Measure the median time to start up with the arguments, by listing the
+        plugins, and the median time to scan the `corpus` directory with them,
+        returning both, the failures reported by the scan, and the last startup.
+        """
+
+        startup_seconds, startup_result = BenchmarkHelpers.measure_median_command(
+            installed_pymarkdown.build_arguments(
+                [*pymarkdown_arguments, "plugins", "list"]
+            ),
+            directory_path,
+            installed_pymarkdown.environment_dict,
+            repeat_count,
+        )
+        assert startup_result.return_code == 0, startup_result.std_error
+        scan_seconds, scan_result = BenchmarkHelpers.measure_median_command(
+            installed_pymarkdown.build_arguments(
+                [*pymarkdown_arguments, "scan", "-r", "corpus"]
+            ),
+            directory_path,
+            installed_pymarkdown.environment_dict,
+            repeat_count,
+        )
+        return (
+            startup_seconds,
+            scan_seconds,
+            BenchmarkHelpers.extract_scan_failures(scan_result.std_out),
+            startup_result,
+        )
+
+    @staticmethod
+    def warm_up_installed_pymarkdown(
+        installed_pymarkdown: InstalledPyMarkdown, directory_path: str
+    ) -> None:
+        """
+        Start up and scan the `corpus` directory once, throwing the times away, so
+        that the first measurement is not charged for a cold file system cache.
+        """
+
+        BenchmarkHelpers.measure_startup_and_scan(
+            installed_pymarkdown, directory_path, [], 1
+        )
+
+    @staticmethod
+    def format_table(column_names: List[str], table_rows: List[List[Any]]) -> str:
+        """
+        Format rows of measurements as a simple text table.
+        """
+
+        formatted_rows = [
+            [f"{i:.3f}" if isinstance(i, float) else str(i) for i in next_row]
+            for next_row in table_rows
+        ]
+        column_widths = [
+            max(len(j) for j in [column_names[i]] + [k[i] for k in formatted_rows])
+            for i in range(len(column_names))
+        ]
+        return "\n".join(
+            "  ".join(j.rjust(column_widths[i]) for i, j in enumerate(next_row))
+            for next_row in [column_names, *formatted_rows]
+        )
+
+    @staticmethod
+    def write_benchmark_report(
+        report_name: str, column_names: List[str], table_rows: List[List[Any]]
+    ) -> str:
+        """
+        Print the measurements as a table, and write them to a JSON file in the
+        `build/test/benchmarks` directory.
+        """
+
+        print(f"Benchmark '{report_name}':\n")
+        print(BenchmarkHelpers.format_table(column_names, table_rows))
+
+        report_directory = os.path.join(os.getcwd(), "build", "test", "benchmarks")
+        os.makedirs(report_directory, exist_ok=True)
+        report_path = os.path.join(report_directory, f"{report_name}.json")
+        with open(report_path, "wt", encoding="utf-8") as output_file:
+            json.dump(
+                [dict(zip(column_names, next_row)) for next_row in table_rows],
+                output_file,
+                indent=4,
+            )
+        print(f"\nBenchmark report written to '{report_path}'.")
+        return report_path
+
+
+def run_measured_command_in_pool(
+    command_details: Tuple[List[str], str, Dict[str, str]]
+) -> MeasuredBob:
+    """
+    Execute a command from a process pool.  This must be a module level function,
+    so that it can be pickled and sent to the processes in the pool.
+    """
+
+    command_arguments, directory_path, environment_dict = command_details
+    return UtilHelpers.run_measured_command(
+        command_arguments, directory_path, environment_dict
+    )
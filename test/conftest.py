@@ -0,0 +1,310 @@
+"""
+Module to provide pytest hooks and options used across the integration tests.
+"""
+import os
+from typing import Any, Generator, List, Optional
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from .profiling_helpers import ProfilingHelpers
+from .result_cache_helpers import ResultCacheHelpers, ScenarioCache
+from .scheduling_helpers import SchedulingHelpers
+from .timing_helpers import TimingHelpers
+from .util_helpers import InstalledPyMarkdown, UtilHelpers
+
+PROFILE_SORT_KEYS = ["cumulative", "tottime", "calls", "pcalls", "name", "filename"]
+
+
+def __is_controller(config: pytest.Config) -> bool:
+    """
+    When running under pytest-xdist, only the controller reports on the session.
+    """
+
+    return not hasattr(config, "workerinput")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """
+    Add the command line options for the integration tests.
+    """
+
+    group = parser.getgroup("pymarkdown", "PyMarkdown integration tests")
+    group.addoption(
+        "--profile-pymarkdown",
+        dest="profile_pymarkdown",
+        action="store_true",
+        default=False,
+        help="execute PyMarkdown under cProfile and report the hottest functions",
+    )
+    group.addoption(
+        "--profile-directory",
+        dest="profile_directory",
+        default=os.path.join("build", "test", "profile"),
+        help="directory to write the .pstats files and hot-function reports to",
+    )
+    group.addoption(
+        "--profile-sort",
+        dest="profile_sort",
+        choices=PROFILE_SORT_KEYS,
+        default="cumulative",
+        help="key used to rank functions in the hot-function reports",
+    )
+    group.addoption(
+        "--profile-limit",
+        dest="profile_limit",
+        type=int,
+        default=50,
+        help="number of functions to include in the hot-function reports",
+    )
+    group.addoption(
+        "--phase-report",
+        dest="phase_report",
+        default=os.path.join("build", "test", "phase_timings.json"),
+        help="JSON file to write the timings of each phase of each test to",
+    )
+    group.addoption(
+        "--phase-summary-limit",
+        dest="phase_summary_limit",
+        type=int,
+        default=10,
+        help="number of the slowest phases to summarize at the end of the session",
+    )
+    group.addoption(
+        "--run-benchmarks",
+        dest="run_benchmarks",
+        action="store_true",
+        default=False,
+        help="execute the benchmark and stress scenarios",
+    )
+    group.addoption(
+        "--force-run",
+        dest="force_run",
+        action="store_true",
+        default=False,
+        help="execute every scenario, even if its inputs have not changed since "
+        + "it last passed",
+    )
+    group.addoption(
+        "--no-history",
+        dest="use_history",
+        action="store_false",
+        default=True,
+        help="do not order tests, distribute tests, or derive timeouts from the "
+        + "duration history of each test, and do not update that history",
+    )
+    group.addoption(
+        "--history-timeout-factor",
+        dest="history_timeout_factor",
+        type=float,
+        default=3.0,
+        help="multiple of the longest recent duration of a test to use as its timeout",
+    )
+    group.addoption(
+        "--history-timeout-minimum",
+        dest="history_timeout_minimum",
+        type=int,
+        default=60,
+        help="minimum timeout, in seconds, to derive for a test from its history",
+    )
+    group.addoption(
+        "--stdin-kilobytes",
+        dest="stdin_kilobytes",
+        default="32,64,128",
+        help="comma separated sizes, in kilobytes, of the documents to stream "
+        + "through scan-stdin in the benchmark scenarios",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """
+    Enable any requested instrumentation before the tests start.
+    """
+
+    if config.getoption("profile_pymarkdown"):
+        profile_directory = os.path.abspath(config.getoption("profile_directory"))
+        if __is_controller(config):
+            ProfilingHelpers.reset_profile_directory(profile_directory)
+        ProfilingHelpers.enable_profiling(profile_directory)
+    if config.getoption("use_history"):
+        SchedulingHelpers.load_duration_history(config)
+    ResultCacheHelpers.set_force_run(
+        config.getoption("force_run") or config.getoption("profile_pymarkdown")
+    )
+
+
+def __should_run_benchmarks(config: pytest.Config) -> bool:
+    """
+    The benchmark scenarios take a long time, so they are only executed if asked
+    for, either through the option or by selecting their marker.
+    """
+
+    return bool(config.getoption("run_benchmarks")) or "benchmarks" in str(
+        config.getoption("markexpr")
+    )
+
+
+def __apply_duration_history(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """
+    Order the tests longest first, and replace the blanket timeout from `pytest.ini`
+    with a timeout derived from the history of each test.  Tests without any history
+    keep the blanket timeout.
+    """
+
+    SchedulingHelpers.order_longest_first(items)
+    if not config.pluginmanager.hasplugin("timeout"):
+        return
+    for item in items:
+        if item.get_closest_marker("timeout"):
+            continue
+        if derived_timeout := SchedulingHelpers.derive_timeout(
+            item.nodeid,
+            config.getoption("history_timeout_factor"),
+            config.getoption("history_timeout_minimum"),
+        ):
+            item.add_marker(pytest.mark.timeout(derived_timeout))
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    """
+    Skip the benchmark scenarios unless asked for, and apply the duration history.
+    """
+
+    if not __should_run_benchmarks(config):
+        skip_benchmark = pytest.mark.skip(
+            reason="benchmark scenarios are only executed with --run-benchmarks"
+        )
+        for item in items:
+            if item.get_closest_marker("benchmarks"):
+                item.add_marker(skip_benchmark)
+    if config.getoption("use_history"):
+        __apply_duration_history(config, items)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config: pytest.Config, log: Any) -> Optional[Any]:
+    """
+    When distributing tests with the `load` mode of pytest-xdist, hand out the
+    tests longest first, instead of in chunks.
+    """
+
+    if not config.getoption("use_history") or config.getvalue("dist") != "load":
+        return None
+
+    # pylint: disable=import-outside-toplevel
+    from .history_scheduling import HistoryScheduling
+
+    # pylint: enable=import-outside-toplevel
+    return HistoryScheduling(config, log)
+
+
+@pytest.fixture(scope="session")
+def installed_pymarkdown(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> InstalledPyMarkdown:
+    """
+    Fixture to install PyMarkdown once for all of the benchmark scenarios.
+    """
+
+    install_directory = str(tmp_path_factory.mktemp("installed_pymarkdown"))
+    return UtilHelpers.install_pymarkdown_for_benchmarks(install_directory)
+
+
+@pytest.fixture
+def scenario_cache(request: pytest.FixtureRequest) -> ScenarioCache:
+    """
+    Fixture to allow a scenario to be skipped if its inputs have not changed
+    since it last passed.
+    """
+
+    return ScenarioCache(request.node)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup() -> None:
+    """
+    Start recording the timing spans for each test as it starts.
+    """
+
+    TimingHelpers.start_test()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(
+    item: pytest.Item, call: pytest.CallInfo[None]
+) -> Generator[None, Any, None]:
+    """
+    Before the final report for a test is made, attach its recorded timing spans
+    as properties, so they travel back from any xdist worker and into any JUnit report.
+    """
+
+    if call.when == "teardown":
+        item.user_properties.extend(
+            TimingHelpers.spans_to_properties(TimingHelpers.finish_test())
+        )
+    yield
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    """
+    Collect the outcome, duration, scenario key, and timing spans of each test
+    as its reports arrive.
+    """
+
+    SchedulingHelpers.record_duration(report.nodeid, report.passed, report.duration)
+    ResultCacheHelpers.record_scenario_outcome(report)
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        TimingHelpers.record_test_outcome(report.nodeid, report.outcome)
+    elif report.when == "teardown":
+        TimingHelpers.record_test_spans(
+            report.nodeid, TimingHelpers.properties_to_spans(report.user_properties)
+        )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """
+    Write any instrumentation reports at the end of the session.
+    """
+
+    config = session.config
+    if __is_controller(config):
+        ResultCacheHelpers.save_passed_scenarios(config)
+    if __is_controller(config) and config.getoption("use_history"):
+        SchedulingHelpers.save_duration_history(config)
+    if __is_controller(config) and TimingHelpers.get_spans_per_test():
+        TimingHelpers.write_phase_report(config.getoption("phase_report"))
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    """
+    At the end of the session, report on any captured instrumentation.
+    """
+
+    config = terminalreporter.config
+    spans_per_test = TimingHelpers.get_spans_per_test()
+    summary_limit = config.getoption("phase_summary_limit")
+    if any(spans_per_test.values()) and summary_limit > 0 and __is_controller(config):
+        terminalreporter.section("PyMarkdown slowest phases")
+        for next_line in TimingHelpers.format_phase_summary(
+            TimingHelpers.summarize_phases(spans_per_test), summary_limit
+        ):
+            terminalreporter.write_line(next_line)
+        terminalreporter.write_line(
+            f"Phase report: {os.path.abspath(config.getoption('phase_report'))}"
+        )
+
+    profile_directory = ProfilingHelpers.get_profile_directory()
+    if profile_directory and __is_controller(config):
+        report_paths = ProfilingHelpers.write_hot_function_report(
+            profile_directory,
+            config.getoption("profile_sort"),
+            config.getoption("profile_limit"),
+        )
+        terminalreporter.section("PyMarkdown profile")
+        if report_paths:
+            terminalreporter.write_line(f"Hot-function report: {report_paths[0]}")
+            terminalreporter.write_line(f"Hot-function JSON: {report_paths[1]}")
+        else:
+            terminalreporter.write_line("No profiles were captured.")
@@ -0,0 +1,62 @@
+"""
+Module to provide a pytest-xdist scheduler that hands out tests longest first.
+"""
+from typing import Any, List, Optional
+
+from xdist.scheduler import LoadScheduling  # type: ignore[import]
+
+PENDING_TESTS_PER_WORKER = 2
+
+
+class HistoryScheduling(LoadScheduling):  # type: ignore[misc]
+    """
+    Class to provide a longest-processing-time-first scheduler for pytest-xdist.
+
+    The tests are expected to already be ordered longest first, from their
+    duration history.  The stock `load` scheduler hands out consecutive chunks
+    of tests, which would give the first worker the two longest tests.  This
+    scheduler instead deals the tests out one at a time, and only tops up a
+    worker when it finishes a test, so that the next longest test always goes
+    to the first worker to become free.  Each worker is kept at two pending
+    tests, as a worker only runs a test once it knows what the next test is.
+    """
+
+    collection: Optional[List[str]]
+
+    def schedule(self) -> None:
+        """
+        Initiate distribution of the tests to the workers.
+        """
+
+        assert self.collection_is_completed
+        if self.collection is not None or not self._check_nodes_have_same_collection():
+            super().schedule()
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = range(len(self.collection))
+        if not self.collection:
+            return
+
+        for _ in range(PENDING_TESTS_PER_WORKER):
+            for node in self.nodes:
+                if self.pending:
+                    self._send_tests(node, 1)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node: Any, duration: float = 0) -> None:
+        """
+        Once a worker has finished a test, send it the next longest test.
+        """
+
+        if node.shutting_down:
+            return
+        if self.pending:
+            node_pending = self.node2pending[node]
+            if len(node_pending) < PENDING_TESTS_PER_WORKER:
+                self._send_tests(node, PENDING_TESTS_PER_WORKER - len(node_pending))
+        else:
+            node.shutdown()
+        self.log("num items waiting for node:", len(self.pending), duration)
@@ -0,0 +1,98 @@
+"""
+Module to provide helper methods for monitoring a process while it executes.
+"""
+import contextlib
+import re
+import time
+from typing import IO, Iterable, List, Optional, Tuple
+
+PROCESS_STATUS_PATH = "/proc/{process_id}/status"
+PEAK_MEMORY_FIELD = "VmHWM:"
+PEAK_MEMORY_POLL_SECONDS = 0.005
+
+
+class ProcessHelpers:
+    """
+    Class to provide helper methods for feeding input to a process, reading its
+    output as it arrives, and measuring its resource usage while it executes.
+    """
+
+    @staticmethod
+    def __read_peak_memory(process_id: int) -> Optional[int]:
+        """
+        Read the high-water mark of the resident memory of the process, in bytes,
+        returning None once the process has exited or if the platform does not
+        provide it.
+        """
+
+        try:
+            with open(
+                PROCESS_STATUS_PATH.format(process_id=process_id),
+                "rt",
+                encoding="utf-8",
+            ) as status_file:
+                for next_line in status_file:
+                    if next_line.startswith(PEAK_MEMORY_FIELD):
+                        return int(next_line.split()[1]) * 1024
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def monitor_peak_memory(process_id: int, peak_memory_bytes: List[int]) -> None:
+        """
+        Sample the peak memory of the process until it exits, keeping the latest
+        sample.  The peak is taken from the process itself, as the peak reported
+        by `wait4` on Linux includes the memory of the parent from before `exec`.
+        """
+
+        while (
+            sampled_bytes := ProcessHelpers.__read_peak_memory(process_id)
+        ) is not None:
+            peak_memory_bytes[:] = [sampled_bytes]
+            time.sleep(PEAK_MEMORY_POLL_SECONDS)
+
+    @staticmethod
+    def read_monitored_output(
+        output_stream: IO[bytes],
+        first_match_expression: Optional[str],
+        start_time: float,
+    ) -> Tuple[str, Optional[float]]:
+        """
+        Read the output as it arrives, noting how long after the start the first
+        line matching the expression appeared.
+        """
+
+        compiled_expression = (
+            re.compile(first_match_expression) if first_match_expression else None
+        )
+        first_match_seconds: Optional[float] = None
+        output_lines: List[str] = []
+        for next_line in output_stream:
+            decoded_line = next_line.decode("utf-8")
+            if (
+                first_match_seconds is None
+                and compiled_expression
+                and compiled_expression.match(decoded_line)
+            ):
+                first_match_seconds = time.perf_counter() - start_time
+            output_lines.append(decoded_line)
+        return "".join(output_lines), first_match_seconds
+
+    @staticmethod
+    def write_input_chunks(
+        input_stream: IO[bytes], input_chunks: Iterable[bytes]
+    ) -> None:
+        """
+        Write each chunk to the input of the process as it is generated, so that
+        the whole input is never held in memory.  If the process exits before
+        reading all the input, the rest of the input is dropped.
+        """
+
+        try:
+            for next_chunk in input_chunks:
+                input_stream.write(next_chunk)
+        except BrokenPipeError:
+            pass
+        with contextlib.suppress(BrokenPipeError):
+            input_stream.close()
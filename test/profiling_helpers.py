@@ -0,0 +1,254 @@
+"""
+Module to provide helper methods for profiling PyMarkdown with cProfile.
+"""
+import json
+import os
+import pstats
+import re
+import shlex
+import shutil
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class ProfilingHelpers:
+    """
+    Class to provide helper methods for capturing PyMarkdown profiles per scenario
+    and merging them into a single hot-function report.
+    """
+
+    __profile_directory: Optional[str] = None
+    __invocation_count: int = 0
+
+    @staticmethod
+    def enable_profiling(profile_directory: str) -> None:
+        """
+        Turn on profiling for every helper that launches PyMarkdown.
+        """
+
+        ProfilingHelpers.__profile_directory = profile_directory
+
+    @staticmethod
+    def get_profile_directory() -> Optional[str]:
+        """
+        Get the directory that `.pstats` files are written to, if profiling is enabled.
+        """
+
+        return ProfilingHelpers.__profile_directory
+
+    @staticmethod
+    def get_pstats_directory(profile_directory: str) -> str:
+        """
+        Get the directory that the individual `.pstats` files are kept in.
+        """
+
+        return os.path.join(profile_directory, "pstats")
+
+    @staticmethod
+    def should_profile(profile_execution: Optional[bool]) -> bool:
+        """
+        Determine whether to profile, with any explicit request overriding the
+        session setting.
+        """
+
+        if profile_execution is None:
+            return ProfilingHelpers.__profile_directory is not None
+        return profile_execution
+
+    @staticmethod
+    def __get_launcher_path() -> str:
+        return os.path.join(
+            os.getcwd(), "test", "resources", "profiling", "profile_entry_point.py"
+        )
+
+    @staticmethod
+    def __get_output_directory() -> str:
+        profile_directory = ProfilingHelpers.__profile_directory or os.path.join(
+            os.getcwd(), "build", "test", "profile"
+        )
+        return ProfilingHelpers.get_pstats_directory(profile_directory)
+
+    @staticmethod
+    def get_current_scenario_name() -> str:
+        """
+        Use the test that pytest is currently running to name the scenario.
+        """
+
+        current_test = os.environ.get("PYTEST_CURRENT_TEST", "unknown").split(" ")[0]
+        current_test = current_test.replace(".py::", ".").split("/")[-1]
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", current_test)
+
+    @staticmethod
+    def __get_launcher_arguments(script_name: str) -> List[str]:
+        ProfilingHelpers.__invocation_count += 1
+        scenario_name = (
+            f"{ProfilingHelpers.get_current_scenario_name()}"
+            + f"-{ProfilingHelpers.__invocation_count}"
+        )
+        return [
+            "python",
+            ProfilingHelpers.__get_launcher_path(),
+            ProfilingHelpers.__get_output_directory(),
+            scenario_name,
+            script_name,
+        ]
+
+    @staticmethod
+    def build_profiled_arguments(run_arguments: List[str]) -> List[str]:
+        """
+        Replace the console script at the start of the arguments with the same
+        script executed under the profiling launcher.
+        """
+
+        return [
+            *ProfilingHelpers.__get_launcher_arguments(run_arguments[0]),
+            *run_arguments[1:],
+        ]
+
+    @staticmethod
+    def localize_precommit_profiling(destination_directory: str) -> None:
+        """
+        Override the `entry` of the PyMarkdown hook in the pre-commit config so
+        that the hook runs PyMarkdown under the profiling launcher, replacing any
+        `entry` that the hook already has, so that the config can be localized
+        more than once.
+        """
+
+        launcher_arguments = [
+            i.replace("\\", "/")
+            for i in ProfilingHelpers.__get_launcher_arguments("pymarkdown")
+        ]
+        entry_value = " ".join(shlex.quote(i) for i in launcher_arguments)
+
+        file_path = os.path.join(destination_directory, ".pre-commit-config.yaml")
+        print(f"Adding profiling entry to '{file_path}'.")
+        with open(file_path, "rt", encoding="utf-8") as input_file:
+            all_lines = input_file.readlines()
+        modified_lines = []
+        hook_indent: Optional[str] = None
+        for next_line in all_lines:
+            line_indent = next_line[: len(next_line) - len(next_line.lstrip())]
+            if hook_indent is not None and next_line.strip():
+                if len(line_indent) < len(hook_indent):
+                    hook_indent = None
+                elif line_indent == hook_indent and next_line.lstrip().startswith(
+                    "entry:"
+                ):
+                    continue
+            modified_lines.append(next_line)
+            if next_line.strip() == "- id: pymarkdown":
+                hook_indent = line_indent + "  "
+                modified_lines.append(
+                    f"{hook_indent}entry: {json.dumps(entry_value)}\n"
+                )
+        with open(file_path, "wt", encoding="utf-8") as output_file:
+            output_file.writelines(modified_lines)
+
+    @staticmethod
+    def reset_profile_directory(profile_directory: str) -> None:
+        """
+        Remove any profiles left over from a previous session.
+        """
+
+        shutil.rmtree(profile_directory, ignore_errors=True)
+        os.makedirs(ProfilingHelpers.get_pstats_directory(profile_directory))
+
+    @staticmethod
+    def __list_profile_files(profile_directory: str) -> List[str]:
+        pstats_directory = ProfilingHelpers.get_pstats_directory(profile_directory)
+        if not os.path.isdir(pstats_directory):
+            return []
+        return sorted(
+            os.path.join(pstats_directory, i)
+            for i in os.listdir(pstats_directory)
+            if i.endswith(".pstats")
+        )
+
+    @staticmethod
+    def __get_scenario_name_from_path(profile_file: str) -> str:
+        return os.path.basename(profile_file).rsplit("-", 1)[0]
+
+    @staticmethod
+    def __count_scenarios_per_function(
+        profile_files: List[str],
+    ) -> Dict[Tuple[str, int, str], int]:
+        """
+        For each function, count how many of the scenarios it showed up in.
+        """
+
+        scenarios_per_function: Dict[Tuple[str, int, str], Set[str]] = {}
+        for next_file in profile_files:
+            scenario_name = ProfilingHelpers.__get_scenario_name_from_path(next_file)
+            file_stats = pstats.Stats(next_file)
+            for function_key in file_stats.stats:  # type: ignore[attr-defined]
+                scenarios_per_function.setdefault(function_key, set()).add(
+                    scenario_name
+                )
+        return {i: len(j) for i, j in scenarios_per_function.items()}
+
+    @staticmethod
+    def __build_json_report(
+        merged_stats: pstats.Stats,
+        scenarios_per_function: Dict[Tuple[str, int, str], int],
+        report_limit: int,
+    ) -> List[Dict[str, Any]]:
+        raw_stats = merged_stats.stats  # type: ignore[attr-defined]
+        report_entries = []
+        for function_key in merged_stats.fcn_list[:report_limit]:  # type: ignore[attr-defined]
+            file_name, line_number, function_name = function_key
+            primitive_calls, total_calls, total_time, cumulative_time, _ = raw_stats[
+                function_key
+            ]
+            report_entries.append(
+                {
+                    "file": file_name,
+                    "line": line_number,
+                    "function": function_name,
+                    "primitive_calls": primitive_calls,
+                    "total_calls": total_calls,
+                    "total_time": total_time,
+                    "cumulative_time": cumulative_time,
+                    "scenario_count": scenarios_per_function.get(function_key, 0),
+                }
+            )
+        return report_entries
+
+    @staticmethod
+    def write_hot_function_report(
+        profile_directory: str, sort_key: str, report_limit: int
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Merge every `.pstats` file captured during the session into one ranked
+        report, written as both text and JSON.
+        """
+
+        profile_files = ProfilingHelpers.__list_profile_files(profile_directory)
+        if not profile_files:
+            return None
+
+        text_report_path = os.path.join(profile_directory, "hot_functions.txt")
+        json_report_path = os.path.join(profile_directory, "hot_functions.json")
+        with open(text_report_path, "wt", encoding="utf-8") as text_file:
+            merged_stats = pstats.Stats(*profile_files, stream=text_file)
+            merged_stats.strip_dirs().sort_stats(sort_key).print_stats(report_limit)
+
+        scenarios_per_function = ProfilingHelpers.__count_scenarios_per_function(
+            profile_files
+        )
+        json_report = {
+            "sort_key": sort_key,
+            "profile_count": len(profile_files),
+            "scenario_count": len(
+                {
+                    ProfilingHelpers.__get_scenario_name_from_path(i)
+                    for i in profile_files
+                }
+            ),
+            "functions": ProfilingHelpers.__build_json_report(
+                pstats.Stats(*profile_files).sort_stats(sort_key),
+                scenarios_per_function,
+                report_limit,
+            ),
+        }
+        with open(json_report_path, "wt", encoding="utf-8") as json_file:
+            json.dump(json_report, json_file, indent=4)
+        return text_report_path, json_report_path
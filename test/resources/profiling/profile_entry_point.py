@@ -0,0 +1,72 @@
+"""
+Script to execute a console script entry point, such as PyMarkdown's `pymarkdown`
+script, under cProfile and save the collected statistics to a `.pstats` file.
+
+This script is executed with the Python interpreter of the environment that
+PyMarkdown is installed into, so it must not depend on anything in the `test`
+package.
+
+Usage:
+    python profile_entry_point.py <output directory> <scenario name> <script name> [arguments...]
+"""
+import cProfile
+import os
+import sys
+from importlib.metadata import entry_points
+from typing import Any, Callable, List, cast
+
+
+def __find_console_script_entry_point(script_name: str) -> Callable[[], Any]:
+    """
+    Find the function behind the named console script in the current environment.
+    """
+
+    all_entry_points = cast(Any, entry_points())
+    if hasattr(all_entry_points, "select"):
+        matching_entry_points = list(
+            all_entry_points.select(group="console_scripts", name=script_name)
+        )
+    else:
+        matching_entry_points = [
+            i
+            for i in all_entry_points.get("console_scripts", [])
+            if i.name == script_name
+        ]
+    assert (
+        matching_entry_points
+    ), f"No console script named '{script_name}' is installed."
+    return cast(Callable[[], Any], matching_entry_points[0].load())
+
+
+def __compute_output_path(output_directory: str, scenario_name: str) -> str:
+    """
+    Each invocation gets its own file, as one scenario may invoke the script many times.
+    """
+
+    os.makedirs(output_directory, exist_ok=True)
+    return os.path.join(output_directory, f"{scenario_name}.{os.getpid()}.pstats")
+
+
+def main(command_line_arguments: List[str]) -> None:
+    """
+    Run the entry point under the profiler, saving the statistics even if the
+    entry point exits through `sys.exit`.
+    """
+
+    output_directory, scenario_name, script_name = command_line_arguments[:3]
+    entry_point_function = __find_console_script_entry_point(script_name)
+    sys.argv = [script_name, *command_line_arguments[3:]]
+
+    exit_code: Any = 0
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(entry_point_function)
+    except SystemExit as this_exception:
+        exit_code = this_exception.code
+    finally:
+        profiler.dump_stats(__compute_output_path(output_directory, scenario_name))
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,196 @@
+"""
+Module to provide helper methods for skipping scenarios whose inputs have not
+changed since they last passed.
+"""
+import hashlib
+import inspect
+import os
+import platform
+import sys
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+PASSED_SCENARIOS_CACHE_KEY = "pymarkdown/passed_scenarios"
+SCENARIO_KEY_PROPERTY = "scenario_key"
+
+
+class ResultCacheHelpers:
+    """
+    Class to provide helper methods for computing the key of a scenario's inputs,
+    and for remembering which keys have passed.
+    """
+
+    __force_run: bool = False
+    __newly_passed_scenarios: Dict[str, str] = {}
+    __newly_failed_scenarios: Set[str] = set()
+
+    @staticmethod
+    def set_force_run(force_run: bool) -> None:
+        """
+        Set whether every scenario is executed, regardless of the cache.
+        """
+
+        ResultCacheHelpers.__force_run = force_run
+
+    @staticmethod
+    def __hash_file(file_path: str, hash_object: "hashlib._Hash") -> None:
+        with open(file_path, "rb") as input_file:
+            for next_block in iter(lambda: input_file.read(65536), b""):
+                hash_object.update(next_block)
+
+    @staticmethod
+    def calculate_file_hash(file_path: str) -> str:
+        """
+        Calculate the SHA256 hash of a single file, such as the package to install.
+        """
+
+        hash_object = hashlib.sha256()
+        ResultCacheHelpers.__hash_file(file_path, hash_object)
+        return hash_object.hexdigest()
+
+    @staticmethod
+    def __hash_resource_directory(test_name: str, hash_object: "hashlib._Hash") -> None:
+        """
+        Hash the relative path and contents of every file in a resource directory.
+        """
+
+        source_directory = os.path.join(os.getcwd(), "test", "resources", test_name)
+        for directory_path, directory_names, file_names in os.walk(source_directory):
+            directory_names.sort()
+            for file_name in sorted(file_names):
+                file_path = os.path.join(directory_path, file_name)
+                relative_path = os.path.relpath(file_path, source_directory)
+                hash_object.update(relative_path.replace("\\", "/").encode("utf-8"))
+                ResultCacheHelpers.__hash_file(file_path, hash_object)
+
+    @staticmethod
+    def __hash_harness(item: pytest.Item, hash_object: "hashlib._Hash") -> None:
+        """
+        Hash the helper modules shared by every test, and the source of the test itself.
+        """
+
+        test_directory = os.path.dirname(__file__)
+        for file_name in sorted(os.listdir(test_directory)):
+            if file_name.endswith(".py") and not file_name.startswith("test_"):
+                ResultCacheHelpers.__hash_file(
+                    os.path.join(test_directory, file_name), hash_object
+                )
+        if test_function := getattr(item, "function", None):
+            hash_object.update(inspect.getsource(test_function).encode("utf-8"))
+
+    @staticmethod
+    def calculate_scenario_key(
+        item: pytest.Item,
+        resource_names: List[str],
+        package_hash: Optional[str] = None,
+        branch_hash: Optional[str] = None,
+    ) -> str:
+        """
+        Calculate a key that changes whenever any of the scenario's inputs change.
+        """
+
+        hash_object = hashlib.sha256()
+        for test_name in resource_names:
+            ResultCacheHelpers.__hash_resource_directory(test_name, hash_object)
+        for next_input in (
+            f"package={package_hash}",
+            f"branch={branch_hash}",
+            f"python={sys.version}",
+            f"platform={sys.platform}/{platform.machine()}",
+        ):
+            hash_object.update(next_input.encode("utf-8"))
+        ResultCacheHelpers.__hash_harness(item, hash_object)
+        return hash_object.hexdigest()
+
+    @staticmethod
+    def skip_if_previously_passed(
+        item: pytest.Item,
+        resource_names: List[str],
+        package_hash: Optional[str] = None,
+        branch_hash: Optional[str] = None,
+    ) -> None:
+        """
+        Skip the scenario, marking it as cached, if a scenario with the same inputs
+        has already passed.  Otherwise, remember its key so that a pass can be recorded.
+        """
+
+        scenario_key = ResultCacheHelpers.calculate_scenario_key(
+            item, resource_names, package_hash, branch_hash
+        )
+        print(f"Scenario key: {scenario_key}")
+        item.user_properties.append((SCENARIO_KEY_PROPERTY, scenario_key))
+        if ResultCacheHelpers.__force_run:
+            return
+        if not (cache := getattr(item.config, "cache", None)):
+            return
+        passed_scenarios = cache.get(PASSED_SCENARIOS_CACHE_KEY, {})
+        if passed_scenarios.get(item.nodeid) == scenario_key:
+            pytest.skip(
+                f"cached: inputs unchanged since last pass ({scenario_key[:12]})"
+            )
+
+    @staticmethod
+    def record_scenario_outcome(report: pytest.TestReport) -> None:
+        """
+        If a scenario passed, record the key of its inputs.  If it failed, forget
+        any earlier pass, so that the next session does not skip it.
+        """
+
+        if report.when != "call" or not (report.passed or report.failed):
+            return
+        for property_name, property_value in report.user_properties:
+            if property_name != SCENARIO_KEY_PROPERTY:
+                continue
+            if report.passed:
+                ResultCacheHelpers.__newly_passed_scenarios[report.nodeid] = str(
+                    property_value
+                )
+                ResultCacheHelpers.__newly_failed_scenarios.discard(report.nodeid)
+            else:
+                ResultCacheHelpers.__newly_passed_scenarios.pop(report.nodeid, None)
+                ResultCacheHelpers.__newly_failed_scenarios.add(report.nodeid)
+
+    @staticmethod
+    def save_passed_scenarios(config: pytest.Config) -> None:
+        """
+        Add the scenarios that passed during this session to the pytest cache,
+        and remove the scenarios that failed during this session from it.
+        """
+
+        if not (
+            ResultCacheHelpers.__newly_passed_scenarios
+            or ResultCacheHelpers.__newly_failed_scenarios
+        ):
+            return
+        if not (cache := getattr(config, "cache", None)):
+            return
+        passed_scenarios = cache.get(PASSED_SCENARIOS_CACHE_KEY, {})
+        passed_scenarios.update(ResultCacheHelpers.__newly_passed_scenarios)
+        for test_id in ResultCacheHelpers.__newly_failed_scenarios:
+            passed_scenarios.pop(test_id, None)
+        cache.set(PASSED_SCENARIOS_CACHE_KEY, passed_scenarios)
+
+
+class ScenarioCache:  # pylint: disable=too-few-public-methods
+    """
+    Class to provide the result cache to a single test, through the
+    `scenario_cache` fixture.
+    """
+
+    def __init__(self, item: pytest.Item) -> None:
+        self.__item = item
+
+    def skip_if_previously_passed(
+        self,
+        resource_names: List[str],
+        package_hash: Optional[str] = None,
+        branch_hash: Optional[str] = None,
+    ) -> None:
+        """
+        Skip this test if its inputs have not changed since it last passed.
+        """
+
+        ResultCacheHelpers.skip_if_previously_passed(
+            self.__item, resource_names, package_hash, branch_hash
+        )
@@ -0,0 +1,101 @@
+"""
+Module to provide helper methods for scheduling tests using their duration history.
+"""
+import math
+from typing import Dict, List, Optional
+
+import pytest
+
+DURATION_HISTORY_CACHE_KEY = "pymarkdown/duration_history"
+DURATION_HISTORY_LENGTH = 5
+
+
+class SchedulingHelpers:
+    """
+    Class to provide helper methods for persisting the duration of each test across
+    sessions, and for using that history to order tests and derive their timeouts.
+    """
+
+    __duration_history: Dict[str, List[float]] = {}
+    __current_durations: Dict[str, float] = {}
+    __failed_tests: List[str] = []
+
+    @staticmethod
+    def load_duration_history(config: pytest.Config) -> Dict[str, List[float]]:
+        """
+        Load the duration history from the pytest cache, if the cache is available.
+        """
+
+        if cache := getattr(config, "cache", None):
+            SchedulingHelpers.__duration_history = cache.get(
+                DURATION_HISTORY_CACHE_KEY, {}
+            )
+        return SchedulingHelpers.__duration_history
+
+    @staticmethod
+    def record_duration(test_id: str, test_passed: bool, duration: float) -> None:
+        """
+        Add the duration of one phase (setup, call, teardown) of a test to its total.
+        Tests that do not pass are not recorded, as hangs and early failures are not
+        representative of how long the test takes.
+        """
+
+        if not test_passed:
+            SchedulingHelpers.__failed_tests.append(test_id)
+        SchedulingHelpers.__current_durations[test_id] = (
+            SchedulingHelpers.__current_durations.get(test_id, 0.0) + duration
+        )
+
+    @staticmethod
+    def save_duration_history(config: pytest.Config) -> None:
+        """
+        Add the durations for this session to the history, keeping only the most
+        recent durations for each test, and save the history to the pytest cache.
+        """
+
+        if not (cache := getattr(config, "cache", None)):
+            return
+        duration_history = cache.get(DURATION_HISTORY_CACHE_KEY, {})
+        for test_id, duration in SchedulingHelpers.__current_durations.items():
+            if test_id in SchedulingHelpers.__failed_tests:
+                continue
+            test_history = duration_history.get(test_id, []) + [round(duration, 3)]
+            duration_history[test_id] = test_history[-DURATION_HISTORY_LENGTH:]
+        cache.set(DURATION_HISTORY_CACHE_KEY, duration_history)
+
+    @staticmethod
+    def estimate_duration(test_id: str) -> Optional[float]:
+        """
+        Estimate how long a test will take, using the mean of its recent durations.
+        """
+
+        if test_history := SchedulingHelpers.__duration_history.get(test_id):
+            return sum(test_history) / len(test_history)
+        return None
+
+    @staticmethod
+    def order_longest_first(items: List[pytest.Item]) -> None:
+        """
+        Order the tests so that the longest running tests are executed first.
+        Tests without any history are assumed to be the longest, so that a new
+        scenario never ends up as the last test to start.
+        """
+
+        def sort_key(item: pytest.Item) -> float:
+            estimated_duration = SchedulingHelpers.estimate_duration(item.nodeid)
+            return math.inf if estimated_duration is None else estimated_duration
+
+        items.sort(key=sort_key, reverse=True)
+
+    @staticmethod
+    def derive_timeout(
+        test_id: str, timeout_factor: float, minimum_timeout: int
+    ) -> Optional[int]:
+        """
+        Derive a timeout for a test from the longest of its recent durations, or
+        None if there is no history to derive it from.
+        """
+
+        if test_history := SchedulingHelpers.__duration_history.get(test_id):
+            return max(minimum_timeout, math.ceil(max(test_history) * timeout_factor))
+        return None
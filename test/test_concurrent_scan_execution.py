@@ -0,0 +1,288 @@
+"""
+Tests to stress many concurrent PyMarkdown scans that share one corpus, one
+configuration file, and one log file, as happens with Pre-Commit batching and
+parallel CI jobs.
+"""
+import concurrent.futures
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+
+from .benchmark_helpers import BenchmarkHelpers, run_measured_command_in_pool
+from .util_helpers import InstalledPyMarkdown, MeasuredBob, UtilHelpers
+
+CORPUS_FILE_COUNT = 100
+SCANS_PER_PROCESS = 3
+MINIMUM_SCALING_EFFICIENCY = 0.5
+LOG_RECORD_START_REGEX = re.compile(
+    r"(CRITICAL|ERROR|WARNING|INFO|DEBUG) \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} "
+)
+
+
+def __get_process_counts() -> List[int]:
+    """
+    Sweep from one process up to the number of cores, doubling each time, and
+    always finishing with the number of cores itself.
+    """
+
+    core_count = os.cpu_count() or 1
+    process_counts = []
+    process_count = 1
+    while process_count < core_count:
+        process_counts.append(process_count)
+        process_count *= 2
+    process_counts.append(core_count)
+    return process_counts
+
+
+def __prepare_shared_inputs(temporary_directory: str) -> Tuple[str, str]:
+    """
+    Generate the corpus and the configuration file that every scan shares.
+    """
+
+    corpus_directory = os.path.join(temporary_directory, "corpus")
+    BenchmarkHelpers.generate_markdown_corpus(corpus_directory, CORPUS_FILE_COUNT)
+    configuration_path = os.path.join(temporary_directory, "shared.json")
+    with open(configuration_path, "wt", encoding="utf-8") as output_file:
+        json.dump({"plugins": {"md013": {"line_length": 100}}}, output_file)
+    return corpus_directory, configuration_path
+
+
+def __run_single_scan(
+    installed_pymarkdown: InstalledPyMarkdown,
+    temporary_directory: str,
+    pymarkdown_arguments: List[str],
+) -> MeasuredBob:
+    """
+    Execute one scan on its own, to provide the results to compare against.
+    """
+
+    return UtilHelpers.run_measured_command(
+        installed_pymarkdown.build_arguments(pymarkdown_arguments),
+        temporary_directory,
+        installed_pymarkdown.environment_dict,
+    )
+
+
+def __run_concurrent_scans(
+    installed_pymarkdown: InstalledPyMarkdown,
+    temporary_directory: str,
+    process_count: int,
+    pymarkdown_arguments: List[str],
+) -> Tuple[float, List[MeasuredBob]]:
+    """
+    Execute the same scan from every process in a pool, several times each,
+    returning the wall time for all the scans and the result of each scan.
+    """
+
+    command_details = (
+        installed_pymarkdown.build_arguments(pymarkdown_arguments),
+        temporary_directory,
+        installed_pymarkdown.environment_dict,
+    )
+    start_time = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=process_count) as executor:
+        scan_results = list(
+            executor.map(
+                run_measured_command_in_pool,
+                [command_details] * (process_count * SCANS_PER_PROCESS),
+            )
+        )
+    return time.perf_counter() - start_time, scan_results
+
+
+def __assert_scans_match_baseline(
+    scan_results: List[MeasuredBob], baseline_result: MeasuredBob
+) -> None:
+    """
+    Every concurrent scan must report exactly what a scan on its own reports.
+    """
+
+    expected_failures = BenchmarkHelpers.extract_scan_failures(baseline_result.std_out)
+    for scan_index, scan_result in enumerate(scan_results):
+        assert scan_result.return_code == baseline_result.return_code, (
+            f"Scan {scan_index} returned {scan_result.return_code} instead of "
+            + f"{baseline_result.return_code}:\n{scan_result.std_error}"
+        )
+        assert (
+            BenchmarkHelpers.extract_scan_failures(scan_result.std_out)
+            == expected_failures
+        ), f"Scan {scan_index} reported different failures than a single scan."
+
+
+def __count_log_records(log_file_path: str) -> int:
+    """
+    Count the log records in a log file, asserting that no record starts in the
+    middle of a line.  Records from concurrent processes that were interleaved
+    show up as a record starting in the middle of another record's line, and
+    records that were lost or truncated show up in the count.
+    """
+
+    with open(log_file_path, "rt", encoding="utf-8") as input_file:
+        all_lines = input_file.read().splitlines()
+    record_count = 0
+    for line_index, next_line in enumerate(all_lines):
+        if LOG_RECORD_START_REGEX.match(next_line):
+            record_count += 1
+        assert not LOG_RECORD_START_REGEX.search(
+            next_line, 1
+        ), f"Line {line_index} of the log file holds more than one record: {next_line}"
+    return record_count
+
+
+def __calculate_scaling_efficiency(
+    throughput_per_process_count: Dict[int, float], process_count: int
+) -> float:
+    """
+    Calculate the speedup over a single process, divided by the number of
+    processes that can actually run at once, which is capped at the number of
+    cores.
+    """
+
+    parallel_count = min(process_count, os.cpu_count() or 1)
+    return throughput_per_process_count[process_count] / (
+        throughput_per_process_count[1] * parallel_count
+    )
+
+
+@pytest.mark.benchmarks
+@pytest.mark.timeout(1800)
+def test_concurrent_scan_throughput_scaling(
+    installed_pymarkdown: InstalledPyMarkdown,
+) -> None:
+    """
+    Test to measure how the aggregate throughput and the tail latency of scans
+    change as the number of concurrent scans grows to the number of cores, and
+    to make sure that each added process contributes a fair share of a single
+    process's throughput.  Scans share nothing but their inputs, so a lower
+    efficiency points at contention for locks or the file system.
+    """
+
+    # Arrange
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        corpus_directory, configuration_path = __prepare_shared_inputs(
+            temporary_directory
+        )
+        pymarkdown_arguments = [
+            "--config",
+            configuration_path,
+            "scan",
+            "-r",
+            corpus_directory,
+        ]
+        baseline_result = __run_single_scan(
+            installed_pymarkdown, temporary_directory, pymarkdown_arguments
+        )
+
+        # Act
+        table_rows = []
+        throughput_per_process_count = {}
+        for process_count in __get_process_counts():
+            wall_seconds, scan_results = __run_concurrent_scans(
+                installed_pymarkdown,
+                temporary_directory,
+                process_count,
+                pymarkdown_arguments,
+            )
+            __assert_scans_match_baseline(scan_results, baseline_result)
+
+            scan_latencies = [i.elapsed_seconds for i in scan_results]
+            files_per_second = CORPUS_FILE_COUNT * len(scan_results) / wall_seconds
+            throughput_per_process_count[process_count] = files_per_second
+            table_rows.append(
+                [
+                    process_count,
+                    len(scan_results),
+                    wall_seconds,
+                    files_per_second,
+                    files_per_second / throughput_per_process_count[1],
+                    __calculate_scaling_efficiency(
+                        throughput_per_process_count, process_count
+                    ),
+                    BenchmarkHelpers.calculate_median(scan_latencies),
+                    BenchmarkHelpers.calculate_percentile(scan_latencies, 95.0),
+                    max(scan_latencies),
+                ]
+            )
+
+        # Assert
+        BenchmarkHelpers.write_benchmark_report(
+            "concurrent_scan_throughput",
+            [
+                "processes",
+                "scans",
+                "wall(s)",
+                "files/s",
+                "speedup",
+                "efficiency",
+                "p50(s)",
+                "p95(s)",
+                "max(s)",
+            ],
+            table_rows,
+        )
+        for process_count in throughput_per_process_count:
+            scaling_efficiency = __calculate_scaling_efficiency(
+                throughput_per_process_count, process_count
+            )
+            assert scaling_efficiency >= MINIMUM_SCALING_EFFICIENCY, (
+                f"Throughput with {process_count} concurrent scans was only "
+                + f"{scaling_efficiency:.2f} of the throughput of a single scan for "
+                + f"each process, below {MINIMUM_SCALING_EFFICIENCY}, indicating "
+                + "contention."
+            )
+
+
+@pytest.mark.benchmarks
+@pytest.mark.timeout(1800)
+def test_concurrent_scan_shared_log_file(
+    installed_pymarkdown: InstalledPyMarkdown,
+) -> None:
+    """
+    Test to make sure that concurrent scans writing to the same log file do not
+    lose, truncate, or interleave each other's log records.
+    """
+
+    # Arrange
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        corpus_directory, configuration_path = __prepare_shared_inputs(
+            temporary_directory
+        )
+        single_log_path = os.path.join(temporary_directory, "single.log")
+        shared_log_path = os.path.join(temporary_directory, "shared.log")
+        scan_arguments = [
+            "--config",
+            configuration_path,
+            "scan",
+            "-r",
+            corpus_directory,
+        ]
+        baseline_result = __run_single_scan(
+            installed_pymarkdown,
+            temporary_directory,
+            ["--log-level", "INFO", "--log-file", single_log_path, *scan_arguments],
+        )
+        records_per_scan = __count_log_records(single_log_path)
+        process_count = __get_process_counts()[-1]
+
+        # Act
+        _, scan_results = __run_concurrent_scans(
+            installed_pymarkdown,
+            temporary_directory,
+            process_count,
+            ["--log-level", "INFO", "--log-file", shared_log_path, *scan_arguments],
+        )
+
+        # Assert
+        __assert_scans_match_baseline(scan_results, baseline_result)
+        shared_record_count = __count_log_records(shared_log_path)
+        print(
+            f"{len(scan_results)} scans from {process_count} processes wrote "
+            + f"{shared_record_count} records, with {records_per_scan} per scan."
+        )
+        assert shared_record_count == records_per_scan * len(scan_results)
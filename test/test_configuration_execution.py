@@ -0,0 +1,165 @@
+"""
+Tests to measure how much loading large configurations, from a file or from
+`--set` arguments, adds to the time PyMarkdown takes to start and to scan.
+"""
+import json
+import os
+import tempfile
+from typing import Any, List, Tuple
+
+import pytest
+
+from .benchmark_helpers import BenchmarkHelpers
+from .util_helpers import InstalledPyMarkdown, UtilHelpers
+
+CORPUS_FILE_COUNT = 20
+REPEAT_COUNT = 3
+FILE_PROPERTY_COUNTS = [100, 1000, 10000, 100000]
+SET_PROPERTY_COUNTS = [10, 100, 400]
+BUDGET_FILE_PROPERTY_COUNT = 1000
+BUDGET_SET_PROPERTY_COUNT = 100
+ADDED_STARTUP_BUDGET_SECONDS = 0.5
+
+
+def __supports_no_json5(
+    installed_pymarkdown: InstalledPyMarkdown, temporary_directory: str
+) -> bool:
+    """
+    Only newer releases of PyMarkdown can read configuration files without JSON5.
+    """
+
+    help_result = UtilHelpers.run_measured_command(
+        installed_pymarkdown.build_arguments(["--help"]),
+        temporary_directory,
+        installed_pymarkdown.environment_dict,
+    )
+    assert help_result.return_code == 0, help_result.std_error
+    return "--no-json5" in help_result.std_out
+
+
+def __get_configuration_variants(
+    temporary_directory: str, supports_no_json5: bool
+) -> List[Tuple[str, int, List[str]]]:
+    """
+    Get the name, property count, and arguments for each configuration to measure,
+    writing out the configuration files as needed.
+    """
+
+    configuration_variants: List[Tuple[str, int, List[str]]] = [("none", 0, [])]
+    for property_count in FILE_PROPERTY_COUNTS:
+        configuration_path = os.path.join(
+            temporary_directory, f"configuration_{property_count}.json"
+        )
+        with open(configuration_path, "wt", encoding="utf-8") as output_file:
+            json.dump(
+                BenchmarkHelpers.generate_configuration(property_count), output_file
+            )
+        configuration_variants.append(
+            ("--config", property_count, ["--config", configuration_path])
+        )
+        if supports_no_json5:
+            configuration_variants.append(
+                (
+                    "--config --no-json5",
+                    property_count,
+                    ["--no-json5", "--config", configuration_path],
+                )
+            )
+    configuration_variants.extend(
+        ("--set", i, BenchmarkHelpers.generate_set_arguments(i))
+        for i in SET_PROPERTY_COUNTS
+    )
+    return configuration_variants
+
+
+@pytest.mark.benchmarks
+@pytest.mark.timeout(3600)
+def test_configuration_loading_overhead(
+    installed_pymarkdown: InstalledPyMarkdown,
+) -> None:
+    """
+    Test to measure the startup and scan latency added by large configuration
+    files and long lists of `--set` arguments, compared to no configuration,
+    and to make sure that a configuration of a realistic size stays within budget.
+    """
+
+    # Arrange
+    table_rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        BenchmarkHelpers.generate_markdown_corpus(
+            os.path.join(temporary_directory, "corpus"), CORPUS_FILE_COUNT, 1
+        )
+        configuration_variants = __get_configuration_variants(
+            temporary_directory,
+            __supports_no_json5(installed_pymarkdown, temporary_directory),
+        )
+        BenchmarkHelpers.warm_up_installed_pymarkdown(
+            installed_pymarkdown, temporary_directory
+        )
+
+        # Act
+        baseline_startup_seconds, baseline_scan_seconds = 0.0, 0.0
+        baseline_failures: List[str] = []
+        added_startup_seconds = {}
+        for (
+            variant_name,
+            property_count,
+            configuration_arguments,
+        ) in configuration_variants:
+            (
+                startup_seconds,
+                scan_seconds,
+                scan_failures,
+                _,
+            ) = BenchmarkHelpers.measure_startup_and_scan(
+                installed_pymarkdown,
+                temporary_directory,
+                configuration_arguments,
+                REPEAT_COUNT,
+            )
+            if not configuration_arguments:
+                baseline_startup_seconds, baseline_scan_seconds = (
+                    startup_seconds,
+                    scan_seconds,
+                )
+                baseline_failures = scan_failures
+            assert (
+                scan_failures == baseline_failures
+            ), f"Configuration '{variant_name}' changed the results of the scan."
+
+            added_startup_seconds[(variant_name, property_count)] = (
+                startup_seconds - baseline_startup_seconds
+            )
+            table_rows.append(
+                [
+                    variant_name,
+                    property_count,
+                    startup_seconds,
+                    startup_seconds - baseline_startup_seconds,
+                    scan_seconds,
+                    scan_seconds - baseline_scan_seconds,
+                ]
+            )
+
+    # Assert
+    BenchmarkHelpers.write_benchmark_report(
+        "configuration_loading_overhead",
+        [
+            "source",
+            "properties",
+            "startup(s)",
+            "startup added(s)",
+            "scan(s)",
+            "scan added(s)",
+        ],
+        table_rows,
+    )
+    for budget_key in (
+        ("--config", BUDGET_FILE_PROPERTY_COUNT),
+        ("--set", BUDGET_SET_PROPERTY_COUNT),
+    ):
+        assert added_startup_seconds[budget_key] <= ADDED_STARTUP_BUDGET_SECONDS, (
+            f"Loading {budget_key[1]} properties with {budget_key[0]} added "
+            + f"{added_startup_seconds[budget_key]:.3f}s to startup, over the "
+            + f"budget of {ADDED_STARTUP_BUDGET_SECONDS}s."
+        )
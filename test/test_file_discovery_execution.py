@@ -0,0 +1,121 @@
+"""
+Tests to measure how PyMarkdown's discovery of files to scan scales on large trees
+that are mostly made up of entries that are not Markdown, separately from how long
+it takes to scan the Markdown files that it finds.
+"""
+import tempfile
+from typing import Optional
+
+import pytest
+
+from .benchmark_helpers import BYTES_PER_MEGABYTE, SCAN_FAILURE_REGEX, BenchmarkHelpers
+from .util_helpers import InstalledPyMarkdown, MonitoredBob, UtilHelpers
+
+NOISE_ENTRY_COUNTS = [0, 1000, 10000, 100000, 300000]
+MARKDOWN_FILE_COUNT = 20
+
+
+def __run_monitored_scan(
+    installed_pymarkdown: InstalledPyMarkdown,
+    tree_directory: str,
+    list_files_only: bool,
+) -> MonitoredBob:
+    """
+    Execute a recursive scan of the tree, or only list the files that it would
+    scan, with the output unbuffered so that the first diagnostic can be timed.
+    """
+
+    environment_dict = dict(installed_pymarkdown.environment_dict)
+    environment_dict["PYTHONUNBUFFERED"] = "1"
+    scan_arguments = (
+        ["scan", "-r", "-l", "."] if list_files_only else ["scan", "-r", "."]
+    )
+    return UtilHelpers.run_monitored_command(
+        installed_pymarkdown.build_arguments(scan_arguments),
+        tree_directory,
+        environment_dict,
+        first_match_expression=SCAN_FAILURE_REGEX.pattern,
+    )
+
+
+def __to_megabytes(memory_bytes: Optional[int]) -> Optional[float]:
+    """
+    Convert a memory measurement to megabytes, if it was measured.
+    """
+
+    return None if memory_bytes is None else memory_bytes / BYTES_PER_MEGABYTE
+
+
+@pytest.mark.benchmarks
+@pytest.mark.timeout(3600)
+def test_file_discovery_scaling(installed_pymarkdown: InstalledPyMarkdown) -> None:
+    """
+    Test to measure how the rate of walking the tree, the time to the first
+    diagnostic, and the peak memory change as the number of entries that are
+    not Markdown grows to the hundreds of thousands, with the Markdown held
+    constant.  The walk is isolated from the scan by listing the files instead
+    of scanning them, with the time of the tree without any noise as the base.
+    """
+
+    # Arrange
+    table_rows = []
+    baseline_list_seconds = 0.0
+    expected_failure_count = BenchmarkHelpers.expected_missing_heading_count(
+        MARKDOWN_FILE_COUNT
+    )
+
+    # Act
+    for noise_entry_count in NOISE_ENTRY_COUNTS:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            created_entry_count = BenchmarkHelpers.generate_noisy_tree(
+                temporary_directory, noise_entry_count, MARKDOWN_FILE_COUNT
+            )
+            list_result = __run_monitored_scan(
+                installed_pymarkdown, temporary_directory, True
+            )
+            scan_result = __run_monitored_scan(
+                installed_pymarkdown, temporary_directory, False
+            )
+
+        assert list_result.return_code == 0, list_result.std_error
+        listed_files = [i for i in list_result.std_out.splitlines() if i.strip()]
+        assert len(listed_files) == MARKDOWN_FILE_COUNT + 1, (
+            f"Listed {len(listed_files)} files instead of {MARKDOWN_FILE_COUNT + 1}, "
+            + "the walk either missed files or followed a symbolic link."
+        )
+        assert scan_result.return_code == 1, scan_result.std_error
+        assert (
+            len(BenchmarkHelpers.extract_scan_failures(scan_result.std_out))
+            == expected_failure_count
+        )
+
+        baseline_list_seconds = baseline_list_seconds or list_result.elapsed_seconds
+        walk_seconds = list_result.elapsed_seconds - baseline_list_seconds
+        table_rows.append(
+            [
+                created_entry_count,
+                list_result.elapsed_seconds,
+                walk_seconds,
+                created_entry_count / walk_seconds if walk_seconds > 0 else None,
+                __to_megabytes(list_result.peak_memory_bytes),
+                scan_result.first_match_seconds,
+                scan_result.elapsed_seconds,
+                __to_megabytes(scan_result.peak_memory_bytes),
+            ]
+        )
+
+    # Assert
+    BenchmarkHelpers.write_benchmark_report(
+        "file_discovery_scaling",
+        [
+            "entries",
+            "list(s)",
+            "walk(s)",
+            "entries/s",
+            "list peak(MB)",
+            "first diag(s)",
+            "scan(s)",
+            "scan peak(MB)",
+        ],
+        table_rows,
+    )
@@ -0,0 +1,168 @@
+"""
+Tests to measure what logging costs PyMarkdown at each log level, when logging to
+the console and to a log file.
+"""
+import os
+import tempfile
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+from .benchmark_helpers import BYTES_PER_MEGABYTE, BenchmarkHelpers
+from .util_helpers import InstalledPyMarkdown, UtilHelpers
+
+CORPUS_FILE_COUNT = 40
+CORPUS_SECTION_COUNT = 3
+REPEAT_COUNT = 3
+LOG_LEVELS = [None, "CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]
+DEFAULT_LEVEL_NAME = "default"
+
+
+def __measure_log_level(
+    installed_pymarkdown: InstalledPyMarkdown,
+    temporary_directory: str,
+    log_level: Optional[str],
+    log_file_path: Optional[str],
+) -> Tuple[float, int, int, List[str]]:
+    """
+    Measure the median time to scan the corpus at the log level, returning the
+    bytes written to the console and to the log file by a single scan, and the
+    failures reported by the scan.  The log file is removed before each scan, as
+    PyMarkdown appends to an existing log file.
+    """
+
+    log_arguments = [] if log_level is None else ["--log-level", log_level]
+    if log_file_path:
+        log_arguments.extend(["--log-file", log_file_path])
+
+    elapsed_seconds: List[float] = []
+    console_bytes, file_bytes, scan_failures = 0, 0, []
+    for _ in range(REPEAT_COUNT):
+        if log_file_path and os.path.exists(log_file_path):
+            os.remove(log_file_path)
+        scan_result = UtilHelpers.run_measured_command(
+            installed_pymarkdown.build_arguments(
+                [*log_arguments, "scan", "-r", "corpus"]
+            ),
+            temporary_directory,
+            installed_pymarkdown.environment_dict,
+        )
+        elapsed_seconds.append(scan_result.elapsed_seconds)
+        console_bytes = len(scan_result.std_out.encode("utf-8")) + len(
+            scan_result.std_error.encode("utf-8")
+        )
+        if log_file_path and os.path.exists(log_file_path):
+            file_bytes = os.path.getsize(log_file_path)
+        scan_failures = BenchmarkHelpers.extract_scan_failures(scan_result.std_out)
+    return (
+        BenchmarkHelpers.calculate_median(elapsed_seconds),
+        console_bytes,
+        file_bytes,
+        scan_failures,
+    )
+
+
+def __measure_destination(
+    installed_pymarkdown: InstalledPyMarkdown,
+    temporary_directory: str,
+    destination: Tuple[str, Optional[str]],
+    default_measurement: Tuple[float, int, List[str]],
+    corpus_megabytes: float,
+) -> List[List[Any]]:
+    """
+    Measure each log level when logging to the destination, returning a row for
+    each level with its throughput relative to the default level and the volume
+    logged for each megabyte scanned.
+    """
+
+    default_seconds, default_console_bytes, default_failures = default_measurement
+    destination_rows: List[List[Any]] = []
+    for log_level in LOG_LEVELS:
+        level_name = log_level or DEFAULT_LEVEL_NAME
+        scan_seconds, console_bytes, file_bytes, scan_failures = __measure_log_level(
+            installed_pymarkdown, temporary_directory, log_level, destination[1]
+        )
+        assert (
+            scan_failures == default_failures
+        ), f"Logging at {level_name} changed the results of the scan."
+        destination_rows.append(
+            [
+                destination[0],
+                level_name,
+                scan_seconds,
+                default_seconds / scan_seconds,
+                (console_bytes - default_console_bytes)
+                / BYTES_PER_MEGABYTE
+                / corpus_megabytes,
+                file_bytes / BYTES_PER_MEGABYTE / corpus_megabytes,
+            ]
+        )
+    return destination_rows
+
+
+@pytest.mark.benchmarks
+@pytest.mark.timeout(3600)
+def test_logging_overhead(installed_pymarkdown: InstalledPyMarkdown) -> None:
+    """
+    Test to measure the throughput of scans at each log level, logging to the
+    console and to a log file, relative to the default level, along with the
+    volume of logging for each megabyte scanned.  The budget for the default
+    level is that it does not log anything, as its throughput differs from that
+    of the other quiet levels by less than the noise between scans.
+    """
+
+    # Arrange
+    table_rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        corpus_megabytes = (
+            BenchmarkHelpers.generate_markdown_corpus(
+                os.path.join(temporary_directory, "corpus"),
+                CORPUS_FILE_COUNT,
+                CORPUS_SECTION_COUNT,
+            )
+            / BYTES_PER_MEGABYTE
+        )
+        BenchmarkHelpers.warm_up_installed_pymarkdown(
+            installed_pymarkdown, temporary_directory
+        )
+        (
+            default_seconds,
+            default_console_bytes,
+            _,
+            default_failures,
+        ) = __measure_log_level(installed_pymarkdown, temporary_directory, None, None)
+
+        # Act
+        for destination in (
+            ("console", None),
+            ("file", os.path.join(temporary_directory, "scan.log")),
+        ):
+            table_rows.extend(
+                __measure_destination(
+                    installed_pymarkdown,
+                    temporary_directory,
+                    destination,
+                    (default_seconds, default_console_bytes, default_failures),
+                    corpus_megabytes,
+                )
+            )
+
+    # Assert
+    BenchmarkHelpers.write_benchmark_report(
+        "logging_overhead",
+        [
+            "destination",
+            "level",
+            "scan(s)",
+            "throughput ratio",
+            "console MB/MB",
+            "file MB/MB",
+        ],
+        table_rows,
+    )
+    for next_row in table_rows:
+        if next_row[1] == DEFAULT_LEVEL_NAME:
+            assert next_row[4] == 0 and next_row[5] == 0, (
+                f"Logging to the {next_row[0]} at the default level wrote "
+                + "log records."
+            )
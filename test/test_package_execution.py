@@ -1,12 +1,12 @@
 """
 Tests to apply the pre-commit hook invocation of PyMarkdown.
 """
-import os
 import tempfile
 from typing import List
 
 import pytest
 
+from .result_cache_helpers import ScenarioCache
 from .util_helpers import UtilHelpers
 
 
@@ -25,15 +25,16 @@ def __xx(expected_output_lines: List[str]) -> None:
 
 
 @pytest.mark.packages
-def test_package_one() -> None:
+def test_package_one(scenario_cache: ScenarioCache) -> None:
     """
     Test to make sure that we can install the package and run it without any arguments.
     """
 
-    print(os.environ.copy())
-
     # Arrange
     UtilHelpers.assert_pymarkdown_install_package_present()
+    scenario_cache.skip_if_previously_passed(
+        ["package_one"], package_hash=UtilHelpers.calculate_package_hash()
+    )
     expected_output_lines = UtilHelpers.load_templated_output(
         "package_one", "output_template"
     )
@@ -41,8 +42,6 @@ def test_package_one() -> None:
         "package_one", "windows_output_template"
     )
     __xx(expected_output_lines)
-    for i, j in enumerate(expected_output_lines):
-        print(f"({i}):{j}")
     __xx(windows_output_lines)
 
     with tempfile.TemporaryDirectory() as temporary_directory:
@@ -50,7 +49,7 @@ def test_package_one() -> None:
             temporary_directory
         )
 
-        pipenv_arguments = ["pymarkdown","version"]
+        pipenv_arguments = ["pymarkdown", "version"]
         bob_sync = UtilHelpers.run_pipenv_run(
             temporary_directory, execution_environment, pipenv_arguments
         )
@@ -74,13 +73,16 @@ def test_package_one() -> None:
 
 
 @pytest.mark.packages
-def test_package_two() -> None:
+def test_package_two(scenario_cache: ScenarioCache) -> None:
     """
     Test to make sure that we can install the package and run it without any arguments.
     """
 
     # Arrange
     UtilHelpers.assert_pymarkdown_install_package_present()
+    scenario_cache.skip_if_previously_passed(
+        ["package_two"], package_hash=UtilHelpers.calculate_package_hash()
+    )
     expected_output_lines = UtilHelpers.load_templated_output(
         "package_two", "output_template"
     )
@@ -93,7 +95,7 @@ def test_package_two() -> None:
             temporary_directory
         )
 
-        pipenv_arguments = ["pymarkdown","version"]
+        pipenv_arguments = ["pymarkdown", "version"]
         bob_sync = UtilHelpers.run_pipenv_run(
             temporary_directory, execution_environment, pipenv_arguments
         )
@@ -0,0 +1,161 @@
+"""
+Tests to measure the cost of loading extra rule plugins with `--add-plugin`, and
+of dispatching every token to them during a scan.
+"""
+import os
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from .benchmark_helpers import BYTES_PER_MEGABYTE, BenchmarkHelpers
+from .util_helpers import InstalledPyMarkdown
+
+CORPUS_FILE_COUNT = 40
+CORPUS_SECTION_COUNT = 3
+REPEAT_COUNT = 5
+PLUGIN_COUNTS = [1, 4, 16, 32]
+WORK_PER_TOKEN_VALUES = [0, 100]
+
+
+def __measure_plugins(
+    installed_pymarkdown: InstalledPyMarkdown,
+    temporary_directory: str,
+    plugin_paths: List[str],
+) -> Tuple[float, float, List[str]]:
+    """
+    Measure the startup and scan times with the plugins, making sure that each
+    of the plugins was registered.
+    """
+
+    plugin_arguments = []
+    for plugin_path in plugin_paths:
+        plugin_arguments.extend(["--add-plugin", plugin_path])
+
+    (
+        startup_seconds,
+        scan_seconds,
+        scan_failures,
+        startup_result,
+    ) = BenchmarkHelpers.measure_startup_and_scan(
+        installed_pymarkdown, temporary_directory, plugin_arguments, REPEAT_COUNT
+    )
+    for plugin_number in range(1, len(plugin_paths) + 1):
+        assert startup_result.does_any_line_match_expression(
+            rf"^\s*syn{plugin_number:03d}\s"
+        ), f"Synthetic plugin {plugin_number} was not registered."
+    return startup_seconds, scan_seconds, scan_failures
+
+
+def __calculate_plugin_costs(
+    work_per_token: int,
+    startup_seconds_per_count: Dict[int, float],
+    scan_seconds_per_count: Dict[int, float],
+    corpus_megabytes: float,
+) -> List[Any]:
+    """
+    Calculate the cost of each plugin from the slopes of the startup and scan
+    times over the number of plugins, with the cost of dispatching tokens being
+    whatever the scan adds over the startup.
+    """
+
+    plugin_counts = list(startup_seconds_per_count.keys())
+    load_seconds_per_plugin = BenchmarkHelpers.calculate_slope(
+        plugin_counts, list(startup_seconds_per_count.values())
+    )
+    dispatch_seconds_per_plugin = (
+        BenchmarkHelpers.calculate_slope(
+            plugin_counts, list(scan_seconds_per_count.values())
+        )
+        - load_seconds_per_plugin
+    )
+    return [
+        work_per_token,
+        load_seconds_per_plugin * 1000.0,
+        dispatch_seconds_per_plugin,
+        dispatch_seconds_per_plugin / corpus_megabytes,
+    ]
+
+
+@pytest.mark.benchmarks
+@pytest.mark.timeout(3600)
+def test_plugin_loading_overhead(installed_pymarkdown: InstalledPyMarkdown) -> None:
+    """
+    Test to measure how the time to load and register plugins, and the time to
+    dispatch tokens to them, grow with the number of plugins added, for plugins
+    that do nothing with each token and for plugins that do some work with each.
+    The cost of each plugin is taken from the slope of the times over the number
+    of plugins, as the cost of one plugin is well within the noise of a single
+    measurement.
+    """
+
+    # Arrange
+    measurement_rows: List[List[Any]] = []
+    cost_rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        corpus_bytes = BenchmarkHelpers.generate_markdown_corpus(
+            os.path.join(temporary_directory, "corpus"),
+            CORPUS_FILE_COUNT,
+            CORPUS_SECTION_COUNT,
+        )
+        BenchmarkHelpers.warm_up_installed_pymarkdown(
+            installed_pymarkdown, temporary_directory
+        )
+        (
+            baseline_startup_seconds,
+            baseline_scan_seconds,
+            baseline_failures,
+        ) = __measure_plugins(installed_pymarkdown, temporary_directory, [])
+
+        # Act
+        for work_per_token in WORK_PER_TOKEN_VALUES:
+            startup_seconds_per_count = {0: baseline_startup_seconds}
+            scan_seconds_per_count = {0: baseline_scan_seconds}
+            for plugin_count in PLUGIN_COUNTS:
+                plugin_paths = BenchmarkHelpers.generate_synthetic_plugins(
+                    os.path.join(
+                        temporary_directory,
+                        f"plugins_{work_per_token}_{plugin_count}",
+                    ),
+                    plugin_count,
+                    work_per_token,
+                )
+                (
+                    startup_seconds_per_count[plugin_count],
+                    scan_seconds_per_count[plugin_count],
+                    scan_failures,
+                ) = __measure_plugins(
+                    installed_pymarkdown, temporary_directory, plugin_paths
+                )
+                assert (
+                    scan_failures == baseline_failures
+                ), "The synthetic plugins changed the results of the scan."
+                measurement_rows.append(
+                    [
+                        plugin_count,
+                        work_per_token,
+                        startup_seconds_per_count[plugin_count],
+                        scan_seconds_per_count[plugin_count],
+                    ]
+                )
+
+            cost_rows.append(
+                __calculate_plugin_costs(
+                    work_per_token,
+                    startup_seconds_per_count,
+                    scan_seconds_per_count,
+                    corpus_bytes / BYTES_PER_MEGABYTE,
+                )
+            )
+
+    # Assert
+    BenchmarkHelpers.write_benchmark_report(
+        "plugin_loading_measurements",
+        ["plugins", "work/token", "startup(s)", "scan(s)"],
+        measurement_rows,
+    )
+    BenchmarkHelpers.write_benchmark_report(
+        "plugin_loading_cost",
+        ["work/token", "load/plugin(ms)", "dispatch/plugin(s)", "s/plugin/MB"],
+        cost_rows,
+    )
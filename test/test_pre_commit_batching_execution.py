@@ -0,0 +1,252 @@
+"""
+Tests to apply the pre-commit hook invocation of PyMarkdown to large changesets,
+where Pre-Commit passes the file names to PyMarkdown in batches.
+"""
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+import pytest
+
+from .benchmark_helpers import BenchmarkHelpers
+from .result_cache_helpers import ScenarioCache
+from .util_helpers import MeasuredBob, UtilHelpers
+
+CORPUS_DIRECTORY_NAME = "docs"
+FILE_LIST_FILE_COUNT = 50
+COMPARISON_FILE_COUNT = 2000
+SCALING_FILE_COUNTS = [1000, 2000, 4000]
+SECTIONS_PER_FILE = 1
+
+
+def __prepare_repository(
+    temporary_directory: str, file_count: int, branch_hash: str
+) -> None:
+    """
+    Create a git repository holding a generated corpus, with the corpus staged
+    so that Pre-Commit sees it with `--all-files`.  The repository starts out
+    with the configuration that passes the file names to PyMarkdown.
+    """
+
+    UtilHelpers.copy_test_resource_directory_to_test_directory(
+        "pre_commit_test_five", temporary_directory
+    )
+    UtilHelpers.localize_precommit_configuration(temporary_directory, branch_hash)
+    BenchmarkHelpers.generate_markdown_corpus(
+        os.path.join(temporary_directory, CORPUS_DIRECTORY_NAME),
+        file_count,
+        SECTIONS_PER_FILE,
+    )
+    UtilHelpers.initialize_git_in_directory(temporary_directory)
+    UtilHelpers.add_files_to_git_in_directory(
+        temporary_directory, [CORPUS_DIRECTORY_NAME]
+    )
+
+
+def __switch_to_whole_tree_scan(temporary_directory: str, branch_hash: str) -> None:
+    """
+    Replace the configuration with one that scans the whole tree in one invocation.
+    """
+
+    UtilHelpers.copy_test_resource_directory_to_test_directory(
+        "pre_commit_test_six", temporary_directory
+    )
+    UtilHelpers.localize_precommit_configuration(temporary_directory, branch_hash)
+
+
+def __get_concurrency_overrides() -> Dict[int, Optional[Dict[str, str]]]:
+    """
+    Pre-Commit either runs its batches on one process, or on one process per core.
+    """
+
+    concurrency_overrides: Dict[int, Optional[Dict[str, str]]] = {
+        1: {"PRE_COMMIT_NO_CONCURRENCY": "1"}
+    }
+    if (core_count := os.cpu_count() or 1) > 1:
+        concurrency_overrides[core_count] = None
+    return concurrency_overrides
+
+
+def __extract_normalized_failures(
+    pre_commit_result: MeasuredBob, temporary_directory: str
+) -> List[str]:
+    """
+    Extract the failures from the Pre-Commit output, with the paths normalized
+    to be relative to the repository, as depending on the version and on how it
+    was invoked, PyMarkdown may report `docs/a.md`, `./docs/a.md`, or an absolute path.
+    """
+
+    directory_prefixes = [
+        os.path.join(i, "")
+        for i in (os.path.realpath(temporary_directory), temporary_directory)
+    ]
+    normalized_failures = []
+    for next_failure in BenchmarkHelpers.extract_scan_failures(
+        pre_commit_result.std_out
+    ):
+        for directory_prefix in directory_prefixes:
+            if next_failure.startswith(directory_prefix):
+                next_failure = next_failure[len(directory_prefix) :]
+                break
+        next_failure = next_failure.replace("\\", "/")
+        if next_failure.startswith("./"):
+            next_failure = next_failure[2:]
+        normalized_failures.append(next_failure)
+    return sorted(normalized_failures)
+
+
+@pytest.mark.pre_commit
+def test_pre_commit_batched_file_list(
+    scenario_cache: ScenarioCache,
+) -> None:  # sourcery skip: extract-method
+    """
+    Test to make sure that when Pre-Commit is given an explicit list of files,
+    PyMarkdown scans each of those files, and only those files.
+    """
+
+    # Arrange
+    branch_hash = UtilHelpers.calculate_branch_hash()
+    scenario_cache.skip_if_previously_passed(
+        ["pre_commit_test_five"], branch_hash=branch_hash
+    )
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        __prepare_repository(temporary_directory, FILE_LIST_FILE_COUNT, branch_hash)
+        selected_files = [
+            os.path.join(
+                CORPUS_DIRECTORY_NAME, BenchmarkHelpers.get_corpus_file_path(i)
+            )
+            for i in range(0, FILE_LIST_FILE_COUNT, 2)
+        ]
+
+        # Act
+        pre_commit_result = UtilHelpers.execute_pre_commit(
+            temporary_directory, file_names=selected_files
+        )
+
+        # Assert
+        assert pre_commit_result.return_code == 1
+        assert pre_commit_result.does_any_line_match_expression(r"PyMarkdown\.*Failed")
+        reported_failures = __extract_normalized_failures(
+            pre_commit_result, temporary_directory
+        )
+        expected_failures = sorted(
+            f"{selected_file.replace(os.sep, '/')}:1:1: MD041: "
+            + "First line in file should be a top level heading "
+            + "(first-line-heading,first-line-h1)"
+            for document_index, selected_file in zip(
+                range(0, FILE_LIST_FILE_COUNT, 2), selected_files
+            )
+            if BenchmarkHelpers.is_missing_heading(document_index)
+        )
+        assert reported_failures == expected_failures
+
+
+@pytest.mark.pre_commit
+@pytest.mark.benchmarks
+@pytest.mark.timeout(3600)
+def test_pre_commit_batched_matches_whole_tree_scan() -> None:
+    """
+    Test to make sure that when Pre-Commit splits thousands of files into batches,
+    the combined results of the batches are the same as the results of scanning
+    the whole tree with one invocation.
+    """
+
+    # Arrange
+    branch_hash = UtilHelpers.calculate_branch_hash()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        __prepare_repository(temporary_directory, COMPARISON_FILE_COUNT, branch_hash)
+
+        # Act
+        batched_result = UtilHelpers.execute_pre_commit(
+            temporary_directory, all_files=True
+        )
+        __switch_to_whole_tree_scan(temporary_directory, branch_hash)
+        whole_tree_result = UtilHelpers.execute_pre_commit(
+            temporary_directory, all_files=True
+        )
+
+        # Assert
+        assert batched_result.return_code == 1
+        assert whole_tree_result.return_code == 1
+        batched_failures = __extract_normalized_failures(
+            batched_result, temporary_directory
+        )
+        whole_tree_failures = __extract_normalized_failures(
+            whole_tree_result, temporary_directory
+        )
+        expected_failure_count = BenchmarkHelpers.expected_missing_heading_count(
+            COMPARISON_FILE_COUNT
+        )
+        assert len(whole_tree_failures) == expected_failure_count
+        assert batched_failures == whole_tree_failures
+        print(
+            f"Batched scan took {batched_result.elapsed_seconds:.3f}s and whole "
+            + f"tree scan took {whole_tree_result.elapsed_seconds:.3f}s for "
+            + f"{COMPARISON_FILE_COUNT} files."
+        )
+
+
+@pytest.mark.pre_commit
+@pytest.mark.benchmarks
+@pytest.mark.timeout(3600)
+def test_pre_commit_batching_scaling() -> None:
+    """
+    Test to measure how the wall time of the Pre-Commit hook scales with the
+    number of files passed to it and with the number of cores it may use,
+    compared to scanning the whole tree with one invocation.
+    """
+
+    # Arrange
+    branch_hash = UtilHelpers.calculate_branch_hash()
+    concurrency_overrides = __get_concurrency_overrides()
+    table_rows = []
+
+    # Act
+    for file_count in SCALING_FILE_COUNTS:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            __prepare_repository(temporary_directory, file_count, branch_hash)
+            serial_seconds = 0.0
+            for job_count, environment_overrides in concurrency_overrides.items():
+                pre_commit_result = UtilHelpers.execute_pre_commit(
+                    temporary_directory,
+                    all_files=True,
+                    environment_overrides=environment_overrides,
+                )
+                assert len(
+                    __extract_normalized_failures(
+                        pre_commit_result, temporary_directory
+                    )
+                ) == BenchmarkHelpers.expected_missing_heading_count(file_count)
+                serial_seconds = serial_seconds or pre_commit_result.elapsed_seconds
+                table_rows.append(
+                    [
+                        "batched",
+                        file_count,
+                        job_count,
+                        pre_commit_result.elapsed_seconds,
+                        file_count / pre_commit_result.elapsed_seconds,
+                        serial_seconds / pre_commit_result.elapsed_seconds,
+                    ]
+                )
+
+            __switch_to_whole_tree_scan(temporary_directory, branch_hash)
+            pre_commit_result = UtilHelpers.execute_pre_commit(
+                temporary_directory, all_files=True
+            )
+            table_rows.append(
+                [
+                    "whole-tree",
+                    file_count,
+                    1,
+                    pre_commit_result.elapsed_seconds,
+                    file_count / pre_commit_result.elapsed_seconds,
+                    serial_seconds / pre_commit_result.elapsed_seconds,
+                ]
+            )
+
+    # Assert
+    BenchmarkHelpers.write_benchmark_report(
+        "pre_commit_batching_scaling",
+        ["mode", "files", "jobs", "wall(s)", "files/s", "speedup"],
+        table_rows,
+    )
@@ -6,11 +6,14 @@ import tempfile
 
 import pytest
 
+from .result_cache_helpers import ScenarioCache
 from .util_helpers import UtilHelpers
 
 
 @pytest.mark.pre_commit
-def test_pre_commit_one() -> None:  # sourcery skip: extract-method
+def test_pre_commit_one(
+    scenario_cache: ScenarioCache,
+) -> None:  # sourcery skip: extract-method
     """
     Test to make sure that PyMarkdown can be invoked through Pre-Commit.
     """
@@ -19,6 +22,9 @@ def test_pre_commit_one() -> None:  # sourcery skip: extract-method
 
     # Arrange
     branch_hash = UtilHelpers.calculate_branch_hash()
+    scenario_cache.skip_if_previously_passed(
+        ["pre_commit_test_one"], branch_hash=branch_hash
+    )
     with tempfile.TemporaryDirectory() as temporary_directory:
         UtilHelpers.copy_test_resource_directory_to_test_directory(
             "pre_commit_test_one", temporary_directory
@@ -35,13 +41,18 @@ def test_pre_commit_one() -> None:  # sourcery skip: extract-method
 
 
 @pytest.mark.pre_commit
-def test_pre_commit_two() -> None:  # sourcery skip: extract-method
+def test_pre_commit_two(
+    scenario_cache: ScenarioCache,
+) -> None:  # sourcery skip: extract-method
     """
     Test to make sure that PyMarkdown can be invoked through Pre-Commit and report an error.
     """
 
     # Arrange
     branch_hash = UtilHelpers.calculate_branch_hash()
+    scenario_cache.skip_if_previously_passed(
+        ["pre_commit_test_two"], branch_hash=branch_hash
+    )
     with tempfile.TemporaryDirectory() as temporary_directory:
         UtilHelpers.copy_test_resource_directory_to_test_directory(
             "pre_commit_test_two", temporary_directory
@@ -64,7 +75,9 @@ def test_pre_commit_two() -> None:  # sourcery skip: extract-method
 
 
 @pytest.mark.pre_commit
-def test_pre_commit_three() -> None:  # sourcery skip: extract-method
+def test_pre_commit_three(
+    scenario_cache: ScenarioCache,
+) -> None:  # sourcery skip: extract-method
     """
     Test to make sure that PyMarkdown can be invoked through Pre-Commit and not report an error
     through disabling on the command line.
@@ -72,6 +85,9 @@ def test_pre_commit_three() -> None:  # sourcery skip: extract-method
 
     # Arrange
     branch_hash = UtilHelpers.calculate_branch_hash()
+    scenario_cache.skip_if_previously_passed(
+        ["pre_commit_test_three"], branch_hash=branch_hash
+    )
     with tempfile.TemporaryDirectory() as temporary_directory:
         UtilHelpers.copy_test_resource_directory_to_test_directory(
             "pre_commit_test_three", temporary_directory
@@ -88,7 +104,9 @@ def test_pre_commit_three() -> None:  # sourcery skip: extract-method
 
 
 @pytest.mark.pre_commit
-def test_pre_commit_four() -> None:  # sourcery skip: extract-method
+def test_pre_commit_four(
+    scenario_cache: ScenarioCache,
+) -> None:  # sourcery skip: extract-method
     """
     Test to make sure that PyMarkdown can be invoked through Pre-Commit and not report an error
     through disabling through a configuration file.
@@ -96,6 +114,9 @@ def test_pre_commit_four() -> None:  # sourcery skip: extract-method
 
     # Arrange
     branch_hash = UtilHelpers.calculate_branch_hash()
+    scenario_cache.skip_if_previously_passed(
+        ["pre_commit_test_four"], branch_hash=branch_hash
+    )
     with tempfile.TemporaryDirectory() as temporary_directory:
         UtilHelpers.copy_test_resource_directory_to_test_directory(
             "pre_commit_test_four", temporary_directory
@@ -0,0 +1,155 @@
+"""
+Tests to stream large generated documents through `pymarkdown scan-stdin`,
+measuring the throughput and the peak memory as the documents grow.
+"""
+import tempfile
+from typing import Iterable, Iterator, List
+
+import pytest
+
+from .benchmark_helpers import BYTES_PER_KILOBYTE, BYTES_PER_MEGABYTE, BenchmarkHelpers
+from .util_helpers import InstalledPyMarkdown, MonitoredBob, UtilHelpers
+
+MEMORY_LINEARITY_TOLERANCE = 2.0
+BASELINE_DOCUMENT = b"# Baseline\n"
+
+
+def __get_stream_sizes(pytestconfig: pytest.Config) -> List[int]:
+    """
+    Get the sizes, in bytes, of the documents to stream, smallest first.
+    """
+
+    return sorted(
+        int(float(i) * BYTES_PER_KILOBYTE)
+        for i in str(pytestconfig.getoption("stdin_kilobytes")).split(",")
+        if i.strip()
+    )
+
+
+def __count_chunk_bytes(
+    input_chunks: Iterable[bytes], chunk_sizes: List[int]
+) -> Iterator[bytes]:
+    """
+    Pass each chunk through, keeping track of its size.
+    """
+
+    for next_chunk in input_chunks:
+        chunk_sizes.append(len(next_chunk))
+        yield next_chunk
+
+
+def __stream_through_scan_stdin(
+    installed_pymarkdown: InstalledPyMarkdown,
+    temporary_directory: str,
+    input_chunks: Iterable[bytes],
+) -> MonitoredBob:
+    """
+    Pipe the chunks into `scan-stdin` as they are generated.
+    """
+
+    return UtilHelpers.run_monitored_command(
+        installed_pymarkdown.build_arguments(["scan-stdin"]),
+        temporary_directory,
+        installed_pymarkdown.environment_dict,
+        input_chunks=input_chunks,
+    )
+
+
+@pytest.mark.benchmarks
+@pytest.mark.timeout(3600)
+def test_scan_stdin_streaming(
+    installed_pymarkdown: InstalledPyMarkdown, pytestconfig: pytest.Config
+) -> None:
+    """
+    Test to measure the throughput and the peak memory of `scan-stdin` as larger
+    and larger documents are streamed through it, and to make sure that the
+    memory used grows with the size of the document, but no faster than it.
+    The baseline is a minimal document that scans cleanly.
+    """
+
+    # Arrange
+    table_rows = []
+    growth_per_input_byte = []
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        baseline_result = __stream_through_scan_stdin(
+            installed_pymarkdown, temporary_directory, [BASELINE_DOCUMENT]
+        )
+        assert baseline_result.return_code == 0, baseline_result.std_error
+
+        # Act
+        for target_bytes in __get_stream_sizes(pytestconfig):
+            chunk_sizes: List[int] = []
+            stream_result = __stream_through_scan_stdin(
+                installed_pymarkdown,
+                temporary_directory,
+                __count_chunk_bytes(
+                    BenchmarkHelpers.generate_markdown_stream(target_bytes),
+                    chunk_sizes,
+                ),
+            )
+            assert stream_result.return_code == 0, (
+                f"Scan of {sum(chunk_sizes)} bytes from standard input failed:\n"
+                + stream_result.std_out
+                + stream_result.std_error
+            )
+
+            input_bytes = sum(chunk_sizes)
+            scan_seconds = (
+                stream_result.elapsed_seconds - baseline_result.elapsed_seconds
+            )
+            memory_growth_bytes = None
+            if (
+                stream_result.peak_memory_bytes is not None
+                and baseline_result.peak_memory_bytes is not None
+            ):
+                memory_growth_bytes = (
+                    stream_result.peak_memory_bytes - baseline_result.peak_memory_bytes
+                )
+                growth_per_input_byte.append(memory_growth_bytes / input_bytes)
+            table_rows.append(
+                [
+                    input_bytes / BYTES_PER_KILOBYTE,
+                    len(chunk_sizes),
+                    stream_result.elapsed_seconds,
+                    input_bytes / BYTES_PER_KILOBYTE / scan_seconds
+                    if scan_seconds > 0
+                    else None,
+                    None
+                    if stream_result.peak_memory_bytes is None
+                    else stream_result.peak_memory_bytes / BYTES_PER_MEGABYTE,
+                    None
+                    if memory_growth_bytes is None
+                    else memory_growth_bytes / BYTES_PER_MEGABYTE,
+                    growth_per_input_byte[-1]
+                    if memory_growth_bytes is not None
+                    else None,
+                ]
+            )
+
+    # Assert
+    BenchmarkHelpers.write_benchmark_report(
+        "scan_stdin_streaming",
+        [
+            "input(KB)",
+            "chunks",
+            "wall(s)",
+            "KB/s",
+            "peak(MB)",
+            "growth(MB)",
+            "growth/byte",
+        ],
+        table_rows,
+    )
+    if len(growth_per_input_byte) > 1:
+        assert growth_per_input_byte[-1] > 0, (
+            "The peak memory did not grow with the size of the document, so it "
+            + "was not measured for the scan itself."
+        )
+        assert (
+            growth_per_input_byte[-1]
+            <= growth_per_input_byte[0] * MEMORY_LINEARITY_TOLERANCE
+        ), (
+            "Memory used per byte of input grew from "
+            + f"{growth_per_input_byte[0]:.1f} to {growth_per_input_byte[-1]:.1f} "
+            + "as the document grew, so memory is growing faster than linearly."
+        )
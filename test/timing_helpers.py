@@ -0,0 +1,226 @@
+"""
+Module to provide helper methods for timing the phases of each test.
+"""
+import contextlib
+import dataclasses
+import functools
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple, TypeVar, cast
+
+TimedFunction = TypeVar("TimedFunction", bound=Callable[..., Any])
+
+PHASE_PROPERTY_PREFIX = "phase:"
+
+
+@dataclasses.dataclass()
+class PhaseSpan:
+    """
+    Class to provide encapsulation on one timed phase within a test.
+    """
+
+    phase_path: str
+    start_seconds: float
+    duration_seconds: float
+
+    @property
+    def phase_name(self) -> str:
+        """
+        Name of the phase, without the names of the phases that it is nested in.
+        """
+        return self.phase_path.split("/")[-1]
+
+
+class TimingHelpers:
+    """
+    Class to provide helper methods for recording nested timing spans around
+    each phase of a test, and for reporting on them at the end of the session.
+    """
+
+    __test_start_time: float = 0.0
+    __active_phases: List[str] = []
+    __recorded_spans: List[PhaseSpan] = []
+    __spans_per_test: Dict[str, List[PhaseSpan]] = {}
+    __outcome_per_test: Dict[str, str] = {}
+
+    @staticmethod
+    def start_test() -> None:
+        """
+        Start recording spans for a new test.
+        """
+
+        TimingHelpers.__test_start_time = time.perf_counter()
+        TimingHelpers.__active_phases = []
+        TimingHelpers.__recorded_spans = []
+
+    @staticmethod
+    def finish_test() -> List[PhaseSpan]:
+        """
+        Stop recording spans for the current test, returning what was recorded.
+        """
+
+        recorded_spans = TimingHelpers.__recorded_spans
+        TimingHelpers.__recorded_spans = []
+        return sorted(recorded_spans, key=lambda i: i.start_seconds)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def timed_phase(phase_name: str) -> Iterator[None]:
+        """
+        Record a span around the enclosed block, nested within any active span.
+        """
+
+        TimingHelpers.__active_phases.append(phase_name)
+        phase_path = "/".join(TimingHelpers.__active_phases)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            end_time = time.perf_counter()
+            TimingHelpers.__active_phases.pop()
+            TimingHelpers.__recorded_spans.append(
+                PhaseSpan(
+                    phase_path,
+                    start_time - TimingHelpers.__test_start_time,
+                    end_time - start_time,
+                )
+            )
+
+    @staticmethod
+    def timed(phase_name: str) -> Callable[[TimedFunction], TimedFunction]:
+        """
+        Decorator to record a span around each call to the decorated function.
+        """
+
+        def decorator(function_to_time: TimedFunction) -> TimedFunction:
+            @functools.wraps(function_to_time)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with TimingHelpers.timed_phase(phase_name):
+                    return function_to_time(*args, **kwargs)
+
+            return cast(TimedFunction, wrapper)
+
+        return decorator
+
+    @staticmethod
+    def record_test_outcome(test_id: str, test_outcome: str) -> None:
+        """
+        Record the outcome of a finished test for the session report.
+        """
+
+        TimingHelpers.__outcome_per_test[test_id] = test_outcome
+
+    @staticmethod
+    def record_test_spans(test_id: str, recorded_spans: List[PhaseSpan]) -> None:
+        """
+        Record the spans of a finished test for the session report.
+        """
+
+        TimingHelpers.__spans_per_test[test_id] = recorded_spans
+
+    @staticmethod
+    def get_spans_per_test() -> Dict[str, List[PhaseSpan]]:
+        """
+        Get the spans recorded for each finished test.
+        """
+
+        return TimingHelpers.__spans_per_test
+
+    @staticmethod
+    def spans_to_properties(recorded_spans: List[PhaseSpan]) -> List[Tuple[str, str]]:
+        """
+        Translate the spans into JUnit properties, one property per span.
+        """
+
+        return [
+            (f"{PHASE_PROPERTY_PREFIX}{i.phase_path}", f"{i.duration_seconds:.3f}")
+            for i in recorded_spans
+        ]
+
+    @staticmethod
+    def properties_to_spans(user_properties: List[Tuple[str, Any]]) -> List[PhaseSpan]:
+        """
+        Translate any JUnit properties for spans back into spans.
+        """
+
+        return [
+            PhaseSpan(i[len(PHASE_PROPERTY_PREFIX) :], 0.0, float(j))
+            for i, j in user_properties
+            if i.startswith(PHASE_PROPERTY_PREFIX)
+        ]
+
+    @staticmethod
+    def summarize_phases(
+        spans_per_test: Dict[str, List[PhaseSpan]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Summarize every span by the name of its phase, slowest total first.
+        """
+
+        durations_per_phase: Dict[str, List[float]] = {}
+        for recorded_spans in spans_per_test.values():
+            for next_span in recorded_spans:
+                durations_per_phase.setdefault(next_span.phase_name, []).append(
+                    next_span.duration_seconds
+                )
+        phase_summaries = [
+            {
+                "phase": phase_name,
+                "count": len(durations),
+                "total_seconds": round(sum(durations), 3),
+                "mean_seconds": round(sum(durations) / len(durations), 3),
+                "max_seconds": round(max(durations), 3),
+            }
+            for phase_name, durations in durations_per_phase.items()
+        ]
+        return sorted(phase_summaries, key=lambda i: -cast(float, i["total_seconds"]))
+
+    @staticmethod
+    def write_phase_report(report_path: str) -> None:
+        """
+        Write the spans for each finished test, and the summary of each phase,
+        to a JSON file.
+        """
+
+        spans_per_test = TimingHelpers.__spans_per_test
+
+        report_directory = os.path.dirname(report_path)
+        if report_directory:
+            os.makedirs(report_directory, exist_ok=True)
+        json_report = {
+            "tests": {
+                test_id: {
+                    "outcome": TimingHelpers.__outcome_per_test.get(test_id, "unknown"),
+                    "phases": [
+                        {
+                            "phase": i.phase_path,
+                            "seconds": round(i.duration_seconds, 3),
+                        }
+                        for i in recorded_spans
+                    ],
+                }
+                for test_id, recorded_spans in spans_per_test.items()
+            },
+            "phases": TimingHelpers.summarize_phases(spans_per_test),
+        }
+        with open(report_path, "wt", encoding="utf-8") as output_file:
+            json.dump(json_report, output_file, indent=4)
+
+    @staticmethod
+    def format_phase_summary(
+        phase_summaries: List[Dict[str, Any]], summary_limit: int
+    ) -> List[str]:
+        """
+        Format the slowest phases as lines of a text table.
+        """
+
+        formatted_lines = [
+            f"{'phase':<32} {'count':>6} {'total(s)':>10} {'mean(s)':>10} {'max(s)':>10}"
+        ]
+        formatted_lines.extend(
+            f"{i['phase']:<32} {i['count']:>6} {i['total_seconds']:>10.3f} "
+            + f"{i['mean_seconds']:>10.3f} {i['max_seconds']:>10.3f}"
+            for i in phase_summaries[:summary_limit]
+        )
+        return formatted_lines
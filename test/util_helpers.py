@@ -9,10 +9,17 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
 import zipfile
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 from urllib.request import Request, urlopen
 
+from .process_helpers import ProcessHelpers
+from .profiling_helpers import ProfilingHelpers
+from .result_cache_helpers import ResultCacheHelpers
+from .timing_helpers import TimingHelpers
+
 
 @dataclasses.dataclass()
 class Bob:
@@ -51,7 +58,46 @@ class Bob:
         )
 
 
-class UtilHelpers:
+@dataclasses.dataclass()
+class MeasuredBob(Bob):
+    """
+    Class to provide encapsulation on what was returned from a process execution,
+    along with measurements taken during that execution.
+    """
+
+    elapsed_seconds: float
+
+
+@dataclasses.dataclass()
+class MonitoredBob(MeasuredBob):
+    """
+    Class to provide encapsulation on what was returned from a process execution,
+    along with when the first interesting line was output, and the peak memory used.
+    Either measurement is None if it was not available.
+    """
+
+    first_match_seconds: Optional[float]
+    peak_memory_bytes: Optional[int]
+
+
+@dataclasses.dataclass()
+class InstalledPyMarkdown:
+    """
+    Class to provide encapsulation on a PyMarkdown package installed into a directory.
+    """
+
+    install_directory: str
+    environment_dict: Dict[str, str]
+    script_path: str
+
+    def build_arguments(self, pymarkdown_arguments: List[str]) -> List[str]:
+        """
+        Build the arguments to execute the installed PyMarkdown script directly.
+        """
+        return [self.script_path, *pymarkdown_arguments]
+
+
+class UtilHelpers:  # pylint: disable=too-many-public-methods
     """
     Class to provide utility helper methods for the integration tests.
     """
@@ -128,6 +174,7 @@ class UtilHelpers:
             return cast(Dict[str, Any], json_object)
 
     @staticmethod
+    @TimingHelpers.timed("download artifact")
     def url_open_binary(url_to_open: str) -> None:
         """
         Submnit a GET request for a binary file that is a zip file,
@@ -149,6 +196,7 @@ class UtilHelpers:
             zip_file.extractall(packages_path)
 
     @staticmethod
+    @TimingHelpers.timed("resolve branch hash")
     def calculate_branch_hash() -> str:
         """
         Calculate the hash to use for the branch.
@@ -172,11 +220,33 @@ class UtilHelpers:
         return branch_hash
 
     @staticmethod
-    def execute_pre_commit(destination_directory: str) -> Bob:
-        """
-        Execute pre-commit in the specified directory.
-        """
+    @TimingHelpers.timed("pre-commit run")
+    def execute_pre_commit(
+        destination_directory: str,
+        profile_execution: Optional[bool] = None,
+        file_names: Optional[List[str]] = None,
+        all_files: bool = False,
+        environment_overrides: Optional[Dict[str, str]] = None,
+    ) -> MeasuredBob:
+        """
+        Execute pre-commit in the specified directory, against the specified files,
+        or against every file tracked by git if `all_files` is set.  If no files
+        are specified, only the `README.md` file is used.  If profiling, the
+        PyMarkdown hook is executed under cProfile.
+        """
+
+        if ProfilingHelpers.should_profile(profile_execution):
+            ProfilingHelpers.localize_precommit_profiling(destination_directory)
+
+        if all_files:
+            file_arguments = ["--all-files"]
+        else:
+            file_arguments = ["--files", *(file_names or ["README.md"])]
+        environment_dict = os.environ.copy()
+        if environment_overrides:
+            environment_dict.update(environment_overrides)
 
+        start_time = time.perf_counter()
         command_result = subprocess.run(
             [
                 "pipenv",
@@ -184,23 +254,27 @@ class UtilHelpers:
                 "pre-commit",
                 "run",
                 "pymarkdown",
-                "--files",
-                "README.md",
+                *file_arguments,
             ],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             cwd=destination_directory,
+            env=environment_dict,
             check=False,
         )
+        elapsed_seconds = time.perf_counter() - start_time
 
         print(f"Pre-Commit code: {str(command_result.returncode)}")
         if std_out := command_result.stdout.decode("utf-8"):
             print("Pre-Commit output:::\n" + std_out + "\n::")
         if std_error := command_result.stderr.decode("utf-8"):
             print("Pre-Commit error:::\n" + std_error + "\n::")
-        return Bob(command_result.returncode, std_out, std_error)
+        return MeasuredBob(
+            command_result.returncode, std_out, std_error, elapsed_seconds
+        )
 
     @staticmethod
+    @TimingHelpers.timed("git init")
     def initialize_git_in_directory(destination_directory: str) -> None:
         """
         Pre-Commit REQUIRES git, even a dummy one. So provide it.
@@ -222,6 +296,32 @@ class UtilHelpers:
             assert False
 
     @staticmethod
+    @TimingHelpers.timed("git add")
+    def add_files_to_git_in_directory(
+        destination_directory: str, relative_paths: List[str]
+    ) -> None:
+        """
+        Pre-Commit only looks at files tracked by git when using `--all-files`,
+        so stage the specified files and directories.
+        """
+
+        command_result = subprocess.run(
+            ["git", "add", "--", *relative_paths],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=destination_directory,
+            check=False,
+        )
+        print(f"Git Add Code: {command_result.returncode}")
+        if command_result.returncode != 0:
+            if std_out := command_result.stdout.decode("utf-8"):
+                print("Git Add output:::\n" + std_out + "\n::")
+            if std_error := command_result.stderr.decode("utf-8"):
+                print("Git Add error:::\n" + std_error + "\n::")
+            assert False
+
+    @staticmethod
+    @TimingHelpers.timed("localize pre-commit configuration")
     def localize_precommit_configuration(
         destination_directory: str, branch_hash: str
     ) -> None:
@@ -309,6 +409,7 @@ class UtilHelpers:
         raise AssertionError(f"{stream_name} not as expected:\n{diff_values}")
 
     @staticmethod
+    @TimingHelpers.timed("pipenv lock")
     def __run_pipenv_lock(directory_path: str, environment_dict: Dict[str, str]) -> Bob:
         """
         Create a pipenv lock file.
@@ -338,6 +439,7 @@ class UtilHelpers:
         return Bob(command_result.returncode, std_out, std_error)
 
     @staticmethod
+    @TimingHelpers.timed("pipenv sync")
     def __run_pipenv_sync(directory_path: str, environment_dict: Dict[str, str]) -> Bob:
         """
         Syncronize to the provided PipEnv packages.
@@ -363,6 +465,7 @@ class UtilHelpers:
         return Bob(command_result.returncode, std_out, std_error)
 
     @staticmethod
+    @TimingHelpers.timed("pipenv install")
     def __run_pipenv_install(
         directory_path: str, environment_dict: Dict[str, str], package_path: str
     ) -> Bob:
@@ -388,29 +491,148 @@ class UtilHelpers:
 
     @staticmethod
     def run_pipenv_run(
-        directory_path: str, environment_dict: Dict[str, str], run_arguments: List[str]
+        directory_path: str,
+        environment_dict: Dict[str, str],
+        run_arguments: List[str],
+        profile_execution: Optional[bool] = None,
     ) -> Bob:
         """
-        Execute a "Pipenv run" command.
+        Execute a "Pipenv run" command.  If profiling, the script named by the
+        first argument is executed under cProfile.
         """
 
+        phase_name = f"pipenv run {run_arguments[0]}"
+        if ProfilingHelpers.should_profile(profile_execution):
+            run_arguments = ProfilingHelpers.build_profiled_arguments(run_arguments)
         pipenv_run_arguments = ["pipenv", "run", *run_arguments]
         print(f"Arguments: {pipenv_run_arguments}")
+        with TimingHelpers.timed_phase(phase_name):
+            command_result = subprocess.run(
+                pipenv_run_arguments,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=directory_path,
+                env=environment_dict,
+                check=False,
+            )
+
+        print(f"Pipenv Install code: {str(command_result.returncode)}")
+        if std_out := command_result.stdout.decode("utf-8"):
+            print("Pipenv Install output:::\n" + std_out + "\n::")
+        if std_error := command_result.stderr.decode("utf-8"):
+            print("Pipenv Install error:::\n" + std_error + "\n::")
+        return Bob(command_result.returncode, std_out, std_error)
+
+    @staticmethod
+    def run_measured_command(
+        command_arguments: List[str],
+        directory_path: str,
+        environment_dict: Optional[Dict[str, str]] = None,
+    ) -> MeasuredBob:
+        """
+        Execute a command directly, without PipEnv, measuring how long it takes.
+        As this is used for repeated benchmark runs, the output is not printed.
+        """
+
+        start_time = time.perf_counter()
         command_result = subprocess.run(
-            pipenv_run_arguments,
+            command_arguments,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             cwd=directory_path,
             env=environment_dict,
             check=False,
         )
+        elapsed_seconds = time.perf_counter() - start_time
+        return MeasuredBob(
+            command_result.returncode,
+            command_result.stdout.decode("utf-8"),
+            command_result.stderr.decode("utf-8"),
+            elapsed_seconds,
+        )
 
-        print(f"Pipenv Install code: {str(command_result.returncode)}")
-        if std_out := command_result.stdout.decode("utf-8"):
-            print("Pipenv Install output:::\n" + std_out + "\n::")
-        if std_error := command_result.stderr.decode("utf-8"):
-            print("Pipenv Install error:::\n" + std_error + "\n::")
-        return Bob(command_result.returncode, std_out, std_error)
+    @staticmethod
+    def run_monitored_command(
+        command_arguments: List[str],
+        directory_path: str,
+        environment_dict: Optional[Dict[str, str]] = None,
+        first_match_expression: Optional[str] = None,
+        input_chunks: Optional[Iterable[bytes]] = None,
+    ) -> MonitoredBob:
+        """
+        Execute a command directly, without PipEnv, measuring how long it takes,
+        how long until the first line of output matching the expression appears,
+        and the peak memory that it uses.  As the output is examined as it arrives,
+        the command should not buffer its output, such as by setting `PYTHONUNBUFFERED`.
+        If provided, the input chunks are piped into the command as they are generated.
+        """
+
+        error_blocks: List[bytes] = []
+        peak_memory_bytes: List[int] = []
+        start_time = time.perf_counter()
+        with subprocess.Popen(
+            command_arguments,
+            stdin=subprocess.DEVNULL if input_chunks is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=directory_path,
+            env=environment_dict,
+        ) as process:
+            assert process.stdout is not None and process.stderr is not None
+            error_stream = process.stderr
+            helper_threads = [
+                threading.Thread(
+                    target=lambda: error_blocks.append(error_stream.read())
+                ),
+                threading.Thread(
+                    target=ProcessHelpers.monitor_peak_memory,
+                    args=(process.pid, peak_memory_bytes),
+                ),
+            ]
+            if input_chunks is not None:
+                assert process.stdin is not None
+                helper_threads.append(
+                    threading.Thread(
+                        target=ProcessHelpers.write_input_chunks,
+                        args=(process.stdin, input_chunks),
+                    )
+                )
+            for helper_thread in helper_threads:
+                helper_thread.start()
+            std_out, first_match_seconds = ProcessHelpers.read_monitored_output(
+                process.stdout, first_match_expression, start_time
+            )
+            process.wait()
+            for helper_thread in helper_threads:
+                helper_thread.join()
+        elapsed_seconds = time.perf_counter() - start_time
+
+        return MonitoredBob(
+            process.returncode,
+            std_out,
+            b"".join(error_blocks).decode("utf-8"),
+            elapsed_seconds,
+            first_match_seconds,
+            peak_memory_bytes[0] if peak_memory_bytes else None,
+        )
+
+    @staticmethod
+    def get_installed_script_path(directory_path: str, script_name: str) -> str:
+        """
+        Get the path to a script installed into the PipEnv virtual environment
+        that was created in the specified directory.
+        """
+
+        if sys.platform.startswith("win"):
+            script_path = os.path.join(
+                directory_path, ".venv", "Scripts", f"{script_name}.exe"
+            )
+        else:
+            script_path = os.path.join(directory_path, ".venv", "bin", script_name)
+        assert os.path.exists(
+            script_path
+        ), f"Script '{script_name}' was not installed at '{script_path}'."
+        return script_path
 
     @staticmethod
     def __search_for_eligible_packages_to_install() -> List[str]:
@@ -450,6 +672,17 @@ class UtilHelpers:
         return os.path.join(packages_path, files[0])
 
     @staticmethod
+    def calculate_package_hash() -> str:
+        """
+        Calculate the SHA256 hash of the one-and-only-one package to install.
+        """
+
+        return ResultCacheHelpers.calculate_file_hash(
+            UtilHelpers.__get_only_package_to_install()
+        )
+
+    @staticmethod
+    @TimingHelpers.timed("copy resources")
     def copy_test_resource_file_to_test_directory(
         test_name: str, file_name: str, destination_directory: str
     ) -> None:
@@ -467,6 +700,7 @@ class UtilHelpers:
         )
 
     @staticmethod
+    @TimingHelpers.timed("copy resources")
     def copy_test_resource_directory_to_test_directory(
         test_name: str, destination_directory: str
     ) -> None:
@@ -618,6 +852,7 @@ class UtilHelpers:
         return branch_hash
 
     @staticmethod
+    @TimingHelpers.timed("install pymarkdown")
     def install_pymarkdown_in_fresh_environment(
         directory_to_install_in: str,
     ) -> Dict[str, str]:
@@ -648,6 +883,28 @@ class UtilHelpers:
         return environment_dict
 
     @staticmethod
+    def install_pymarkdown_for_benchmarks(
+        directory_to_install_in: str,
+    ) -> InstalledPyMarkdown:
+        """
+        Install PyMarkdown into a fresh environment, so that the benchmark scenarios
+        can execute its script directly, without the overhead of PipEnv.
+        """
+
+        UtilHelpers.assert_pymarkdown_install_package_present()
+        environment_dict = UtilHelpers.install_pymarkdown_in_fresh_environment(
+            directory_to_install_in
+        )
+        return InstalledPyMarkdown(
+            directory_to_install_in,
+            environment_dict,
+            UtilHelpers.get_installed_script_path(
+                directory_to_install_in, "pymarkdown"
+            ),
+        )
+
+    @staticmethod
+    @TimingHelpers.timed("locate package")
     def assert_pymarkdown_install_package_present() -> None:
         """
         Assert that a pymarkdown package is present and that it is installed.